@@ -3,21 +3,22 @@
 # requires-python = ">=3.8"
 # ///
 
-import json
+import fcntl
+import os
 import sys
-from pathlib import Path
+import time
 from typing import Dict, Optional
 
-# Add path resolution for proper imports
-sys.path.insert(0, str(Path(__file__).parent.parent))  # Get to maos directory
-# Import MAOS backend utilities
-try:
-    from utils.backend import MAOSBackend, extract_file_path_from_tool_input
-    from utils.path_utils import MAOS_DIR
-except ImportError:
-    # Fallback if backend not available
-    MAOSBackend = None
-    MAOS_DIR = Path.cwd() / '.maos'
+# Hook scripts put the maos directory on sys.path before importing this module
+from utils.backend import get_backend, extract_file_path_from_tool_input
+from utils.json_utils import loads, JSONDecodeError
+from utils.path_utils import MAOS_DIR
+
+# Minimum seconds between worktree cleanup passes
+CLEANUP_INTERVAL_SECONDS = 300
+
+# ((st_mtime_ns, st_size, st_ino), session_id) from the last active_session.json read
+_ACTIVE_SID_CACHE = (None, None)
 
 
 class MAOSPostCoordinator:
@@ -25,23 +26,39 @@ class MAOSPostCoordinator:
     
     def __init__(self, hook_metadata=None):
         self.hook_metadata = hook_metadata or {}
-        self.backend = MAOSBackend() if MAOSBackend else None
+        self.backend = get_backend()
+        self._session_id = None
     
     def get_active_session_id(self):
-        """Get active session ID"""
-        if not self.backend:
-            return None
+        """Get active session ID (looked up once per coordinator)"""
+        if self._session_id is None and self.backend:
+            self._session_id = self._read_active_session_id()
+        return self._session_id
+    
+    def _read_active_session_id(self):
+        """Read active session ID (re-parsed only when active_session.json changes)"""
+        global _ACTIVE_SID_CACHE
         
         # Check for active session
         active_file = MAOS_DIR / "active_session.json"
-        if active_file.exists():
-            try:
-                with open(active_file) as f:
-                    return json.load(f).get('session_id')
-            except (json.JSONDecodeError, KeyError, FileNotFoundError):
-                pass
+        try:
+            st = os.stat(active_file)
+        except FileNotFoundError:
+            return None
+        
+        # The file is replaced by rename, so a new inode catches switches within one mtime tick
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        cached_stamp, cached_session_id = _ACTIVE_SID_CACHE
+        if stamp == cached_stamp:
+            return cached_session_id
+        
+        try:
+            session_id = loads(active_file.read_bytes()).get('session_id')
+        except (JSONDecodeError, KeyError, FileNotFoundError):
+            return None
         
-        return None
+        _ACTIVE_SID_CACHE = (stamp, session_id)
+        return session_id
     
     def handle_file_operation_completion(self, tool_name, tool_input, tool_response):
         """Handle completion of file operations"""
@@ -124,10 +141,15 @@ class MAOSPostCoordinator:
             return
         
         try:
-            # Only run cleanup occasionally to avoid overhead
-            import random
-            if random.random() > 0.1:  # 10% chance of running cleanup
-                return
+            # Run at most once per interval, tracked by the marker file's mtime
+            marker = MAOS_DIR / ".cleanup_ts"
+            now = time.time()
+            try:
+                if now - os.stat(marker).st_mtime < CLEANUP_INTERVAL_SECONDS:
+                    return
+                os.utime(marker, (now, now))
+            except FileNotFoundError:
+                marker.touch()
             
             self.backend.cleanup_completed_worktrees()
             
@@ -148,29 +170,17 @@ class MAOSPostCoordinator:
             # Update session activity
             session_dir = MAOS_DIR / "sessions" / session_id
             if session_dir.exists():
-                activity_file = session_dir / "activity.json"
-                
-                activity_data = {
-                    'last_activity': json.loads(json.dumps(Path().cwd().name, default=str)),  # Current timestamp
-                    'last_tool': tool_name,
-                    'total_operations': 1
-                }
-                
-                # Load existing activity
-                if activity_file.exists():
-                    try:
-                        with open(activity_file) as f:
-                            existing = json.load(f)
-                            activity_data['total_operations'] = existing.get('total_operations', 0) + 1
-                    except (json.JSONDecodeError, FileNotFoundError):
-                        pass
-                
-                # Save updated activity
-                from datetime import datetime
-                activity_data['last_activity'] = datetime.now().isoformat()
+                # Bump the operation counter in place (8-byte little-endian int)
+                fd = os.open(session_dir / "activity.count", os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                    total_operations = int.from_bytes(os.pread(fd, 8, 0).ljust(8, b"\0"), 'little') + 1
+                    os.pwrite(fd, total_operations.to_bytes(8, 'little'), 0)
+                finally:
+                    os.close(fd)
                 
-                with open(activity_file, 'w') as f:
-                    json.dump(activity_data, f, indent=2)
+                # Snapshot replaces the previous one outright - nothing to re-parse
+                self.backend.record_activity(session_id, tool_name, total_operations)
             
         except Exception as e:
             # Non-blocking error
@@ -182,6 +192,10 @@ def handle_maos_post_tool(tool_name: str, tool_input: Dict, tool_response: Dict
     # Initialize MAOS post-coordinator
     coordinator = MAOSPostCoordinator(hook_metadata)
     
+    # Nothing to coordinate without a backend and an active session
+    if not coordinator.backend or not coordinator.get_active_session_id():
+        return
+    
     # Handle file operation completion
     if tool_name in ["Edit", "Write", "MultiEdit", "Read"]:
         coordinator.handle_file_operation_completion(tool_name, tool_input, tool_response)
@@ -194,4 +208,7 @@ def handle_maos_post_tool(tool_name: str, tool_input: Dict, tool_response: Dict
     coordinator.update_session_activity(tool_name)
     
     # Periodic cleanup
-    coordinator.cleanup_completed_worktrees()
\ No newline at end of file
+    coordinator.cleanup_completed_worktrees()
+    
+    # Write back any coordination state touched during this hook
+    coordinator.backend.flush()
\ No newline at end of file
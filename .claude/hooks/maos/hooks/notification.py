@@ -2,61 +2,44 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "orjson",
 #     "python-dotenv",
 # ]
 # ///
 
 import argparse
-import json
 import os
 import sys
-import subprocess
-import random
 from pathlib import Path
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
-
-
-
 # Add path resolution for proper imports
+# (config, dotenv and logging are imported where used, so a hook that
+# neither speaks nor fails only pays for what it touches)
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils.path_utils import LOGS_DIR, TTS_DIR
-from utils.config import is_notification_tts_enabled, get_active_tts_provider
-from utils.async_logging import log_hook_data_sync
-
+from utils.path_utils import NOTIFICATION_LOG
+from utils.json_utils import loads, JSONDecodeError
+from utils.time_utils import iso_now
 
-def get_tts_script_path():
-    """
-    Determine which TTS script to use based on configuration.
-    """
-    # Get active provider from config
-    provider = get_active_tts_provider()
-    
-    # Map providers to script paths using TTS_DIR constant
-    script_map = {
-        "macos": TTS_DIR / "macos.py",
-        "elevenlabs": TTS_DIR / "elevenlabs.py", 
-        "openai": TTS_DIR / "openai.py",
-        "pyttsx3": TTS_DIR / "pyttsx3.py"
-    }
-    
-    tts_script = script_map.get(provider)
-    if tts_script and tts_script.exists():
-        return str(tts_script)
-    
-    return None
 
 def fire_tts_notification():
     """Fire TTS notification immediately - no blocking."""
     try:
+        from utils.config import is_notification_tts_enabled
+        
         if not is_notification_tts_enabled():
             return False
             
-        tts_script = get_tts_script_path()
+        # .env is only needed for the spoken name and the TTS provider's keys,
+        # so load it before the (cached) provider choice looks for those keys
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            pass  # dotenv is optional
+        
+        from utils.tts_client import resolve_tts_script, say
+        
+        tts_script = resolve_tts_script()
         if not tts_script:
             return False
         
@@ -64,15 +47,13 @@ def fire_tts_notification():
         engineer_name = os.getenv('ENGINEER_NAME', '').strip()
         
         # Create notification message with 30% chance to include name
-        if engineer_name and random.random() < 0.3:
+        notification_message = "Your agent needs your input"
+        # (one random byte below 77 is a 77/256 ~ 30% chance, without importing random)
+        if engineer_name and os.urandom(1)[0] < 77:
             notification_message = f"{engineer_name}, your agent needs your input"
-        else:
-            notification_message = "Your agent needs your input"
         
-        # Fire TTS in background - don't wait for completion
-        subprocess.Popen([
-            "uv", "run", tts_script, notification_message
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Hand off to the TTS worker - don't wait for completion
+        say(tts_script, notification_message)
         
         return True
         
@@ -88,8 +69,8 @@ def main():
         parser.add_argument('--notify', action='store_true', help='Enable TTS notifications')
         args = parser.parse_args()
         
-        # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        # Read JSON input from stdin (raw bytes straight into the parser)
+        input_data = loads(sys.stdin.buffer.read())
         
         # Validate Claude Code provided required fields
         if 'session_id' not in input_data:
@@ -101,21 +82,18 @@ def main():
         if args.notify and input_data.get('message') != 'Claude is waiting for your input':
             fire_tts_notification()
         
-        # 📝 LOGGING IN FIRE-AND-FORGET MODE (don't wait)
-        # Enhance Claude Code's input with our timestamp
-        from datetime import datetime
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            **input_data,  # Preserve all Claude Code fields as-is
-        }
-        
-        log_path = LOGS_DIR / "notification.jsonl"
-        log_hook_data_sync(log_path, log_data)
+        # 📝 LOGGING AS A SINGLE APPEND (one write, no fsync)
+        # Claude Code's input as-is, with our timestamp written in front of it
+        from utils.jsonl_log import log_hook_data_sync
+        log_path = NOTIFICATION_LOG
+        log_hook_data_sync(log_path, input_data, timestamp=iso_now())
         
-        # Exit immediately - don't wait for logging to complete
-        sys.exit(0)
+        # Exit immediately - the TTS hand-off is detached and the log line is
+        # already written, so skip interpreter teardown
+        sys.stderr.flush()
+        os._exit(0)
         
-    except json.JSONDecodeError:
+    except JSONDecodeError:
         sys.exit(0)  # Graceful exit on bad JSON
     except Exception:
         sys.exit(0)  # Graceful exit on any error
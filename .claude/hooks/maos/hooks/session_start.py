@@ -2,31 +2,25 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
-#     "python-dotenv",
+#     "orjson",
 # ]
 # ///
 
-import json
 import sys
 from pathlib import Path
-from datetime import datetime
-
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
 
 # Add path resolution for proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils.path_utils import LOGS_DIR, MAOS_DIR
-from utils.async_logging import log_hook_data_sync
+from utils.path_utils import LOGS_DIR, MAOS_DIR, SESSION_START_LOG
+from utils.json_utils import loads, JSONDecodeError
+from utils.time_utils import iso_now
+from utils.jsonl_log import log_hook_data_sync
 
 def main():
     """Handle session start event (new or resumed session)"""
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = loads(sys.stdin.buffer.read())
         
         # Get session ID
         session_id = input_data.get('session_id', 'unknown')
@@ -42,13 +36,13 @@ def main():
         
         # Log session start with enhanced data
         log_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': iso_now(),
             'event_type': 'session_start',
             'is_resumed': is_resumed,
             **input_data
         }
         
-        log_path = LOGS_DIR / "session_start.jsonl"
+        log_path = SESSION_START_LOG
         log_hook_data_sync(log_path, log_data)
         
         if is_resumed:
@@ -58,7 +52,7 @@ def main():
         
         sys.exit(0)
         
-    except json.JSONDecodeError:
+    except JSONDecodeError:
         sys.exit(0)  # Graceful exit on bad JSON
     except Exception:
         sys.exit(0)  # Graceful exit on any error
@@ -2,15 +2,15 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "orjson",
 #     "python-dotenv",
 # ]
 # ///
 
 import argparse
-import json
+import fcntl
 import os
 import sys
-import subprocess
 import random
 import time
 from pathlib import Path
@@ -23,44 +23,37 @@ except ImportError:
 
 # Add path resolution for proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils.config import is_response_tts_enabled, is_completion_tts_enabled, get_engineer_name, get_active_tts_provider
-from utils.path_utils import PROJECT_ROOT, LOGS_DIR, TTS_DIR
-from utils.async_logging import log_hook_data_sync
+from utils.config import is_response_tts_enabled, is_completion_tts_enabled, get_engineer_name
+from utils.path_utils import PROJECT_ROOT, LOGS_DIR, CHAT_LOG, STOP_LOG
+from utils.json_utils import loads, load_json_file, atomic_write_json, JSONDecodeError
+from utils.time_utils import iso_now
+from utils.jsonl_log import log_hook_data_sync
+from utils.tts_client import resolve_tts_script, say, tts_script_path
 
+# Transcripts are scanned backwards in chunks of this size
+TRANSCRIPT_CHUNK_BYTES = 64 * 1024
 
-def get_completion_messages():
-    """Return list of friendly completion messages with engineer name."""
+# --chat mirror of the transcripts, and how many bytes of each have been copied
+CHAT_OFFSETS = LOGS_DIR / 'chat.offset'
+
+
+# Completion phrases; {prefix} and {suffix} carry the engineer's name when one is set
+_COMPLETION_TEMPLATES = (
+    "{prefix}All done!",
+    "{prefix}We're ready for next task!",
+    "Work complete{suffix}",
+    "Task finished{suffix}",
+    "Job complete{suffix}"
+)
+
+
+def get_completion_message():
+    """Return a random friendly completion message with engineer name."""
     engineer_name = get_engineer_name()
-    name_prefix = f"Hey {engineer_name}! " if engineer_name else ""
-    name_suffix = f", {engineer_name}!" if engineer_name else "!"
-    
-    return [
-        f"{name_prefix}All done!",
-        f"{name_prefix}We're ready for next task!",
-        f"Work complete{name_suffix}",
-        f"Task finished{name_suffix}",
-        f"Job complete{name_suffix}"
-    ]
-
-
-def get_tts_script_path():
-    """Determine which TTS script to use based on configuration."""
-    # Get active provider from config
-    provider = get_active_tts_provider()
-    
-    # Map providers to script paths using TTS_DIR constant
-    script_map = {
-        "macos": TTS_DIR / "macos.py",
-        "elevenlabs": TTS_DIR / "elevenlabs.py",
-        "openai": TTS_DIR / "openai.py", 
-        "pyttsx3": TTS_DIR / "pyttsx3.py"
-    }
-    
-    tts_script = script_map.get(provider)
-    if tts_script and tts_script.exists():
-        return str(tts_script)
-    
-    return None
+    return random.choice(_COMPLETION_TEMPLATES).format(
+        prefix=f"Hey {engineer_name}! " if engineer_name else "",
+        suffix=f", {engineer_name}!" if engineer_name else "!"
+    )
 
 
 def fire_completion_tts():
@@ -74,18 +67,15 @@ def fire_completion_tts():
         if not is_completion_tts_enabled():
             return False
         
-        tts_script = get_tts_script_path()
+        tts_script = resolve_tts_script()
         if not tts_script:
             return False
         
         # Get random completion message
-        completion_messages = get_completion_messages()
-        completion_message = random.choice(completion_messages)
+        completion_message = get_completion_message()
         
-        # Fire TTS in background - don't wait for completion
-        subprocess.Popen([
-            "uv", "run", tts_script, completion_message
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Hand off to the TTS worker - don't wait for completion
+        say(tts_script, completion_message)
         
         return True
         
@@ -93,6 +83,50 @@ def fire_completion_tts():
         return False
 
 
+def iter_lines_reversed(path):
+    """Yield the lines of a file last-first, reading backwards in fixed-size chunks."""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > 0:
+            read_len = min(TRANSCRIPT_CHUNK_BYTES, pos)
+            pos -= read_len
+            f.seek(pos)
+            lines = (f.read(read_len) + partial).split(b"\n")
+            # The first piece may continue in the previous chunk
+            partial = lines[0]
+            yield from reversed(lines[1:])
+        yield partial
+
+
+def get_latest_assistant_text(transcript_path):
+    """Return the text of the last assistant message, parsing only the transcript's tail."""
+    for line in iter_lines_reversed(transcript_path):
+        if not line.strip():
+            continue
+        try:
+            data = loads(line)
+        except JSONDecodeError:
+            continue
+        
+        # Handle nested message structure
+        msg = data.get('message', {})
+        if msg.get('role') != 'assistant' or not msg.get('content'):
+            continue
+        
+        content = msg['content']
+        # Handle both string content and array of content blocks
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            # Extract text from the first text block
+            for block in content:
+                if isinstance(block, dict) and block.get('type') == 'text':
+                    return block.get('text', '')
+    
+    return None
+
+
 def fire_response_tts(input_data):
     """Fire response TTS if enabled."""
     try:
@@ -104,44 +138,21 @@ def fire_response_tts(input_data):
             return False
         
         # Get the latest assistant response from transcript
-        latest_response = None
         try:
-            with open(transcript_path, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        try:
-                            data = json.loads(line.strip())
-                            # Handle nested message structure
-                            msg = data.get('message', {})
-                            if msg.get('role') == 'assistant' and msg.get('content'):
-                                content = msg['content']
-                                # Handle both string content and array of content blocks
-                                if isinstance(content, str):
-                                    latest_response = content
-                                elif isinstance(content, list) and content:
-                                    # Extract text from content blocks
-                                    for block in content:
-                                        if isinstance(block, dict) and block.get('type') == 'text':
-                                            latest_response = block.get('text', '')
-                                            break
-                        except json.JSONDecodeError:
-                            continue
+            latest_response = get_latest_assistant_text(transcript_path)
         except Exception:
             return False
         
         if not latest_response:
             return False
         
-        # Get response TTS script using TTS_DIR constant
-        tts_script = TTS_DIR / "response.py"
-        
-        if not tts_script.exists():
+        # Get response TTS script
+        tts_script = tts_script_path("response")
+        if not tts_script:
             return False
         
-        # Fire TTS in background - don't wait
-        subprocess.Popen([
-            "uv", "run", str(tts_script), latest_response
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # Hand off to the TTS worker - don't wait
+        say(tts_script, latest_response)
         
         return True
         
@@ -149,29 +160,105 @@ def fire_response_tts(input_data):
         return False
 
 
+def _last_line_end(src_fd, start, end):
+    """Offset just past the last newline in [start, end) of src_fd, or start if there is none."""
+    pos = end
+    while pos > start:
+        read_len = min(TRANSCRIPT_CHUNK_BYTES, pos - start)
+        pos -= read_len
+        newline = os.pread(src_fd, read_len, pos).rfind(b"\n")
+        if newline != -1:
+            return pos + newline + 1
+    return start
+
+
+def _copy_range(src_fd, dst_fd, offset, count):
+    """Write count bytes of src_fd starting at offset at dst_fd's position, in the kernel where possible.
+    
+    dst_fd must not be O_APPEND: Linux sendfile() rejects such a destination.
+    Returns True only if all count bytes were copied.
+    """
+    end = offset + count
+    try:
+        while offset < end:
+            sent = os.sendfile(dst_fd, src_fd, offset, end - offset)
+            if sent == 0:
+                return False  # Source shrank underneath us
+            offset += sent
+        return True
+    except OSError:
+        pass  # No file-to-file sendfile here (e.g. macOS) - copy the rest through userspace
+    
+    while offset < end:
+        chunk = memoryview(os.pread(src_fd, min(TRANSCRIPT_CHUNK_BYTES, end - offset), offset))
+        if not chunk:
+            return False
+        while chunk:
+            written = os.write(dst_fd, chunk)
+            chunk = chunk[written:]
+            offset += written
+    return True
+
+
 def copy_transcript_to_chat(input_data):
-    """Copy new transcript entries to chat.jsonl in append-only mode."""
+    """Copy new transcript entries to chat.jsonl in append-only mode.
+    
+    chat.offset remembers how far each transcript has been copied, so every
+    stop appends only the bytes added since the previous one. Only whole
+    lines are copied: a trailing line Claude Code is still writing waits for
+    the next stop, so nothing else appended to chat.jsonl lands mid-record.
+    """
     try:
         transcript_path = input_data.get('transcript_path')
-        if not transcript_path or not os.path.exists(transcript_path):
+        if not transcript_path:
             return False
         
-        # Get the chat log file
-        chat_file = LOGS_DIR / 'chat.jsonl'
-        chat_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Instead of reading entire transcript and rewriting everything,
-        # just append new entries since last processing
-        # For now, append the stop event itself as a chat entry
-        chat_entry = {
-            'event': 'stop',
-            'session_id': input_data.get('session_id'),
-            'transcript_path': transcript_path,
-            'cwd': input_data.get('cwd', '')
-        }
+        try:
+            src_fd = os.open(transcript_path, os.O_RDONLY | os.O_CLOEXEC)
+        except OSError:
+            return False
         
-        # Use unified async logger (adds timestamp automatically)
-        log_hook_data_sync(chat_file, chat_entry)
+        try:
+            LOGS_DIR.mkdir(parents=True, exist_ok=True)
+            # No O_APPEND (sendfile refuses it); the flock below serializes every
+            # writer of chat.jsonl, so seeking to its end under the lock is enough
+            dst_fd = os.open(CHAT_LOG, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o644)
+            try:
+                # Serialize concurrent stop hooks so no range is copied twice
+                fcntl.flock(dst_fd, fcntl.LOCK_EX)
+                
+                try:
+                    offsets = load_json_file(CHAT_OFFSETS)
+                except (OSError, JSONDecodeError):
+                    offsets = {}
+                
+                last = offsets.get(transcript_path, 0)
+                size = os.fstat(src_fd).st_size
+                if size < last:
+                    last = 0  # Transcript was replaced - start over
+                
+                # Stop at the end of the last complete line
+                end = _last_line_end(src_fd, last, size)
+                if end == last:
+                    return True
+                
+                chat_size = os.fstat(dst_fd).st_size
+                os.lseek(dst_fd, chat_size, os.SEEK_SET)
+                try:
+                    copied = _copy_range(src_fd, dst_fd, last, end - last)
+                except OSError:
+                    copied = False
+                if not copied:
+                    # Drop the partial range (we hold the lock) and keep the old watermark
+                    os.ftruncate(dst_fd, chat_size)
+                    return False
+                
+                offsets[transcript_path] = end
+                atomic_write_json(CHAT_OFFSETS, offsets, indent=False)
+            finally:
+                os.close(dst_fd)  # Releases the flock
+        finally:
+            os.close(src_fd)
         
         return True
         
@@ -188,7 +275,7 @@ def main():
         args = parser.parse_args()
         
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = loads(sys.stdin.buffer.read())
         
         # Validate Claude Code provided required fields
         if 'session_id' not in input_data:
@@ -212,15 +299,9 @@ def main():
         
         # 📝 BACKGROUND OPERATIONS (fire-and-forget)
         
-        # Log to JSONL format with enhanced data
-        from datetime import datetime
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            **input_data,  # Preserve all Claude Code fields as-is
-        }
-        
-        log_path = LOGS_DIR / "stop.jsonl"
-        log_hook_data_sync(log_path, log_data)
+        # Log Claude Code's input as-is, with our timestamp written in front of it
+        log_path = STOP_LOG
+        log_hook_data_sync(log_path, input_data, timestamp=iso_now())
         
         # Copy transcript to chat if requested
         if args.chat:
@@ -229,7 +310,7 @@ def main():
         # Exit immediately - don't wait for background operations
         sys.exit(0)
         
-    except json.JSONDecodeError:
+    except JSONDecodeError:
         sys.exit(0)  # Graceful exit on bad JSON
     except Exception:
         sys.exit(0)  # Graceful exit on any error
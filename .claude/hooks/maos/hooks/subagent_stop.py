@@ -2,15 +2,15 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "orjson",
 #     "python-dotenv",
 # ]
 # ///
 
 import argparse
-import json
+import fcntl
 import os
 import sys
-import subprocess
 from pathlib import Path
 
 try:
@@ -22,37 +22,11 @@ except ImportError:
 
 # Add path resolution for proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils.path_utils import PROJECT_ROOT, LOGS_DIR, TTS_DIR
-from utils.config import is_completion_tts_enabled, get_active_tts_provider
-from utils.async_logging import log_hook_data_sync
-
-
-def get_tts_script_path():
-    """
-    Determine which TTS script to use based on config.json provider setting.
-    Environment variables are only used for authentication, NOT provider selection.
-    """
-    # Use config.json to determine provider (canonical authority)
-    provider = get_active_tts_provider()
-    
-    # Map provider to script file using TTS_DIR constant
-    provider_scripts = {
-        'elevenlabs': TTS_DIR / "elevenlabs.py",
-        'openai': TTS_DIR / "openai.py", 
-        'macos': TTS_DIR / "macos.py",
-        'pyttsx3': TTS_DIR / "pyttsx3.py"
-    }
-    
-    script_path = provider_scripts.get(provider)
-    if script_path and script_path.exists():
-        return str(script_path)
-    
-    # Fallback to macos if configured provider not available
-    fallback_script = TTS_DIR / "macos.py" 
-    if fallback_script.exists():
-        return str(fallback_script)
-        
-    return None
+from utils.path_utils import PROJECT_ROOT, LOGS_DIR, CHAT_LOG, SUBAGENT_STOP_LOG
+from utils.config import is_completion_tts_enabled
+from utils.json_utils import loads, JSONDecodeError
+from utils.jsonl_log import log_hook_data_sync
+from utils.tts_client import resolve_tts_script, say
 
 
 def announce_subagent_completion():
@@ -62,22 +36,17 @@ def announce_subagent_completion():
         if not is_completion_tts_enabled():
             return  # TTS disabled via config
             
-        tts_script = get_tts_script_path()
+        tts_script = resolve_tts_script()
         if not tts_script:
             return  # No TTS scripts available
         
         # Use fixed message for subagent completion
         completion_message = "Subagent Complete"
         
-        # Call the TTS script with the completion message
-        subprocess.run([
-            "uv", "run", tts_script, completion_message
-        ], 
-        capture_output=True,  # Suppress output
-        timeout=10  # 10-second timeout
-        )
+        # Hand off to the TTS worker - don't wait for the announcement
+        say(tts_script, completion_message)
         
-    except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
+    except OSError:
         # Fail silently if TTS encounters issues
         pass
     except Exception:
@@ -93,7 +62,7 @@ def main():
         args = parser.parse_args()
         
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = loads(sys.stdin.buffer.read())
         
         # Validate Claude Code provided required fields
         if 'session_id' not in input_data:
@@ -101,38 +70,33 @@ def main():
             # Don't exit - subagent stop hooks should still work
             
         # Use unified async logger for subagent stop events
-        log_path = LOGS_DIR / "subagent_stop.jsonl"
+        log_path = SUBAGENT_STOP_LOG
         log_hook_data_sync(log_path, input_data)
         
         # Handle --chat switch (same as stop.py)
         if args.chat and 'transcript_path' in input_data:
             transcript_path = input_data['transcript_path']
             if os.path.exists(transcript_path):
-                # Read .jsonl file and convert to JSON array
-                chat_data = []
+                # Stream the transcript straight into logs/chat.jsonl, one line at a time
                 try:
-                    with open(transcript_path, 'r') as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    chat_data.append(json.loads(line))
-                                except json.JSONDecodeError:
-                                    pass  # Skip invalid lines
-                    
-                    # Write to logs/chat.jsonl using unified async logger
-                    chat_file = LOGS_DIR / 'chat.jsonl'
-                    for entry in chat_data:
-                        log_hook_data_sync(chat_file, entry)
+                    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+                    with open(transcript_path, 'rb') as src, open(CHAT_LOG, 'ab') as chat_out:
+                        # Same lock stop.py holds while copying, so the two copies don't interleave
+                        fcntl.flock(chat_out, fcntl.LOCK_EX)
+                        for line in src:
+                            # Cheap shape check instead of a full parse; skips blank and invalid lines
+                            if not line.lstrip().startswith((b'{', b'[')):
+                                continue
+                            chat_out.write(line if line.endswith(b'\n') else line + b'\n')
                 except Exception:
                     pass  # Fail silently
-
+        
         # Announce subagent completion via TTS
         announce_subagent_completion()
-
+        
         sys.exit(0)
-
-    except json.JSONDecodeError:
+    
+    except JSONDecodeError:
         # Handle JSON decode errors gracefully
         sys.exit(0)
     except Exception:
@@ -2,13 +2,14 @@
 # /// script
 # requires-python = ">=3.11"
 # dependencies = [
+#     "orjson",
 #     "python-dotenv",
 # ]
 # ///
 
 import argparse
-import json
 import os
+import re
 import sys
 from pathlib import Path
 
@@ -21,44 +22,50 @@ except ImportError:
 
 # Add path resolution for proper imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils.path_utils import PROJECT_ROOT, LOGS_DIR
-from utils.async_logging import log_hook_data_sync
+from utils.path_utils import PROJECT_ROOT, USER_PROMPT_LOG
+from utils.json_utils import loads, JSONDecodeError
+from utils.jsonl_log import log_hook_data_sync
+from utils.time_utils import iso_now
 
 
 def log_user_prompt(session_id, input_data):
     """Log user prompt using unified async logger."""
-    from datetime import datetime
     try:
-        log_file = LOGS_DIR / 'user_prompt_submit.jsonl'
+        log_file = USER_PROMPT_LOG
         
-        # Enhance Claude Code's input with our timestamp
-        log_data = {
-            'timestamp': datetime.now().isoformat(),
-            **input_data,  # Preserve all Claude Code fields as-is
-        }
-        
-        log_hook_data_sync(log_file, log_data)
+        # Our timestamp is spliced in front of Claude Code's fields, which are kept as-is
+        log_hook_data_sync(log_file, input_data, timestamp=iso_now())
     except Exception:
         # Silent failure for logging - don't block user prompt processing
         pass
 
 
+# Example validation rules (customize as needed)
+BLOCKED_PATTERNS = [
+    # Add any patterns you want to block
+    # Example: ('rm -rf /', 'Dangerous command detected'),
+]
+
+# Lowercased pattern -> reason, plus one alternation that finds any of them in a
+# single scan of the prompt (first listed pattern wins when several match)
+_BLOCKED_REASONS = {}
+for _pattern, _reason in BLOCKED_PATTERNS:
+    _BLOCKED_REASONS.setdefault(_pattern.lower(), _reason)
+_BLOCKED_RE = re.compile('|'.join(map(re.escape, _BLOCKED_REASONS))) if _BLOCKED_REASONS else None
+
+
 def validate_prompt(prompt):
     """
     Validate the user prompt for security or policy violations.
     Returns tuple (is_valid, reason).
     """
-    # Example validation rules (customize as needed)
-    blocked_patterns = [
-        # Add any patterns you want to block
-        # Example: ('rm -rf /', 'Dangerous command detected'),
-    ]
-    
-    prompt_lower = prompt.lower()
+    # Nothing configured (the default) - skip lowercasing the prompt entirely
+    if _BLOCKED_RE is None:
+        return True, None
     
-    for pattern, reason in blocked_patterns:
-        if pattern.lower() in prompt_lower:
-            return False, reason
+    match = _BLOCKED_RE.search(prompt.lower())
+    if match:
+        return False, _BLOCKED_REASONS[match.group()]
     
     return True, None
 
@@ -74,7 +81,7 @@ def main():
         args = parser.parse_args()
         
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = loads(sys.stdin.buffer.read())
         
         # Validate Claude Code provided required fields
         if 'session_id' not in input_data:
@@ -104,7 +111,7 @@ def main():
         # Success - prompt will be processed
         sys.exit(0)
         
-    except json.JSONDecodeError:
+    except JSONDecodeError:
         # Handle JSON decode errors gracefully
         sys.exit(0)
     except Exception:
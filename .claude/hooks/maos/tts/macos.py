@@ -66,7 +66,8 @@ def speak_with_macos(text, voice=None, use_process_manager=True):
             # Legacy synchronous mode (for compatibility)
             result = subprocess.run(
                 command,
-                capture_output=True,
+                stdout=subprocess.DEVNULL,  # Only stderr is reported
+                stderr=subprocess.PIPE,
                 text=True
             )
             
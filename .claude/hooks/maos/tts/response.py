@@ -148,7 +148,8 @@ def speak_with_native_macos(text):
             "--quality", str(quality),
             clean_text
         ], 
-        capture_output=True,
+        stdout=subprocess.DEVNULL,  # Only stderr is reported
+        stderr=subprocess.PIPE,
         text=True,
         timeout=timeout
         )
@@ -0,0 +1,129 @@
+"""
+Persistent TTS worker for one provider script.
+
+Hooks hand messages to this process over a unix datagram socket (see
+utils/tts_client.py) instead of cold-starting `uv run <provider>.py` for
+every announcement. The worker imports the provider script once and runs its
+main() for each message, so messages are also spoken one at a time rather
+than over each other.
+
+It is started by the client under an interpreter that has the provider's
+PEP 723 dependencies, serves one socket per provider script, and exits after
+WORKER_IDLE_SECONDS without a message. It only binds inside a 0700 directory
+owned by the current user (the client's RUN_DIR).
+
+Run directly with:  python tts/worker.py <socket path> <provider script>
+"""
+
+import asyncio
+import fcntl
+import importlib.util
+import inspect
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+
+# Worker exits after this long without a message
+WORKER_IDLE_SECONDS = 30 * 60
+
+# Largest datagram accepted; longer messages are spoken by one-off processes
+MAX_MESSAGE_BYTES = 64 * 1024
+
+
+def load_provider(tts_script: str):
+    """Import a TTS provider script as a module (its __main__ block does not run)"""
+    spec = importlib.util.spec_from_file_location("maos_tts_provider", tts_script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def speak(provider, tts_script: str, message: str):
+    """Run the provider's main() as if it had been invoked with message"""
+    sys.argv = [tts_script, message]
+    try:
+        result = provider.main()
+        if inspect.iscoroutine(result):
+            asyncio.run(result)  # openai.py's main() is async
+    except SystemExit:
+        pass  # Providers exit on their own errors; keep serving
+    except Exception:
+        pass
+
+
+def dir_is_private(path: str) -> bool:
+    """True if path is a real directory owned by us that nobody else can enter"""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def serve(sock_path: str, tts_script: str):
+    """Speak messages from sock_path until idle for WORKER_IDLE_SECONDS"""
+    if not dir_is_private(os.path.dirname(sock_path)):
+        return  # Messages could be read by others; clients fall back to one-off processes
+    
+    # Only one worker per socket: hold an exclusive lock for our lifetime
+    try:
+        lock_fd = os.open(f"{sock_path}.lock", os.O_WRONLY | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+    except OSError:
+        return
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(lock_fd)
+        return  # Another worker is already serving
+    
+    provider = load_provider(tts_script)
+    
+    try:
+        os.unlink(sock_path)  # Left behind by a worker that died
+    except FileNotFoundError:
+        pass
+    except OSError:
+        os.close(lock_fd)
+        return
+    
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(sock_path)
+    except OSError:
+        server.close()
+        os.close(lock_fd)
+        return
+    finally:
+        os.umask(old_umask)
+    server.settimeout(WORKER_IDLE_SECONDS)
+    
+    # Remove the socket on a plain kill as well
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    try:
+        while True:
+            try:
+                data = server.recv(MAX_MESSAGE_BYTES)
+            except socket.timeout:
+                break
+            
+            try:
+                message = json.loads(data)["message"]
+            except (ValueError, KeyError, TypeError):
+                continue  # Not one of ours
+            speak(provider, tts_script, message)
+    finally:
+        server.close()
+        try:
+            os.unlink(sock_path)
+        except FileNotFoundError:
+            pass
+        os.close(lock_fd)
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1], sys.argv[2])
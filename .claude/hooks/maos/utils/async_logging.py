@@ -9,7 +9,11 @@ import time
 from pathlib import Path
 from typing import Dict, Any
 from concurrent.futures import ThreadPoolExecutor
-from datetime import datetime
+
+from .time_utils import iso_now
+# The synchronous writer lives in jsonl_log so hooks can use it without importing asyncio
+from .jsonl_log import _append_jsonl, log_hook_data_sync
+
 
 class AsyncJSONLLogger:
     """
@@ -62,7 +66,7 @@ class AsyncJSONLLogger:
         
         # Add timestamp for better debugging
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": iso_now(utc=True),
             **data
         }
         
@@ -75,18 +79,8 @@ class AsyncJSONLLogger:
         Direct write without batching for simple cases.
         """
         try:
-            # Ensure directory exists
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Add timestamp
-            log_entry = {
-                "timestamp": datetime.utcnow().isoformat(),
-                **data
-            }
-            
-            # Append single line to JSONL file
-            with open(log_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(log_entry, separators=(',', ':')) + '\n')
+            # Add timestamp and append single line to JSONL file
+            _append_jsonl(log_file, iso_now(utc=True), data)
         
         except Exception:
             # Fail silently for logging
@@ -167,77 +161,8 @@ class AsyncJSONLLogger:
             pass
 
 
-class BackgroundTaskManager:
-    """
-    Manager for non-blocking background tasks in hooks.
-    
-    Handles tasks like:
-    - MAOS orchestration
-    - Rust formatting
-    - File processing
-    """
-    
-    def __init__(self, max_workers: int = 4):
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        self._tasks = []
-    
-    async def run_background_task(self, func, *args, timeout: float = 30.0) -> None:
-        """
-        Run a function in background without blocking.
-        
-        Args:
-            func: Function to run
-            *args: Arguments for function
-            timeout: Maximum time to wait (default: 30 seconds)
-        """
-        try:
-            loop = asyncio.get_event_loop()
-            task = loop.run_in_executor(self.executor, func, *args)
-            self._tasks.append(task)
-            
-            # Fire and forget with timeout
-            await asyncio.wait_for(task, timeout=timeout)
-            
-        except asyncio.TimeoutError:
-            # Don't block if background task takes too long
-            pass
-        except Exception:
-            # Don't block on background task errors
-            pass
-        finally:
-            # Clean up completed tasks
-            self._tasks = [t for t in self._tasks if not t.done()]
-    
-    def run_fire_and_forget(self, func, *args) -> None:
-        """
-        Run a function in background and completely forget about it.
-        Use for truly non-critical tasks.
-        """
-        try:
-            self.executor.submit(func, *args)
-        except Exception:
-            # Even submission failures shouldn't block
-            pass
-    
-    async def shutdown(self, timeout: float = 5.0) -> None:
-        """Shutdown background tasks gracefully."""
-        # Wait for pending tasks to complete (with timeout)
-        if self._tasks:
-            try:
-                await asyncio.wait_for(
-                    asyncio.gather(*self._tasks, return_exceptions=True),
-                    timeout=timeout
-                )
-            except asyncio.TimeoutError:
-                pass
-        
-        # Shutdown executor
-        self.executor.shutdown(wait=True)
-
-
 # Global instances for hook system
 _logger = None
-_task_manager = None
 
 def get_async_logger() -> AsyncJSONLLogger:
     """Get the global async logger instance."""
@@ -246,34 +171,18 @@ def get_async_logger() -> AsyncJSONLLogger:
         _logger = AsyncJSONLLogger(max_workers=2, batch_size=5)
     return _logger
 
-def get_task_manager() -> BackgroundTaskManager:
-    """Get the global background task manager."""
-    global _task_manager
-    if _task_manager is None:
-        _task_manager = BackgroundTaskManager(max_workers=4)
-    return _task_manager
-
 async def log_hook_data(log_file: Path, data: Dict[Any, Any]) -> None:
     """Convenience function for async hook logging."""
     logger = get_async_logger()
     await logger.log_async(log_file, data)
 
-def log_hook_data_sync(log_file: Path, data: Dict[Any, Any]) -> None:
-    """Convenience function for sync hook logging."""
-    logger = get_async_logger()
-    logger.log_sync(log_file, data)
-
 async def cleanup_async_systems():
     """Clean up global async systems."""
-    global _logger, _task_manager
+    global _logger
     
     if _logger:
         await _logger.stop()
         _logger = None
-    
-    if _task_manager:
-        await _task_manager.shutdown()
-        _task_manager = None
 
 
 if __name__ == "__main__":
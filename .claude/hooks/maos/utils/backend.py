@@ -3,18 +3,41 @@
 # requires-python = ">=3.8"
 # ///
 
-import json
+import atexit
+import os
 import subprocess
 import sys
 import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 from .state_manager import MAOSStateManager
 from .file_locking import MAOSFileLockManager
+from .json_utils import WriteBatch, atomic_write_json, load_json_file, dumps, loads, JSONDecodeError
+from .time_utils import format_ts
+from .jsonl_log import close_logs_under
 from .path_utils import PROJECT_ROOT, MAOS_DIR, LOGS_DIR, HOOKS_DIR, WORKTREES_DIR
 
+# Fold progress.jsonl into the progress.json summary once the log passes this size
+PROGRESS_COMPACT_BYTES = 256 * 1024
+
+# Concurrent git processes used for worktree provisioning and cleanup
+MAX_GIT_WORKERS = 8
+
+# Tools that take a file lock for the duration of the operation
+FILE_LOCK_TOOLS = frozenset({"Edit", "Write", "MultiEdit"})
+
+
+class FileOpContext(NamedTuple):
+    """Agent and lock state for one file operation, gathered in a single backend call"""
+    agent_state: Optional[str]
+    workspace_path: Optional[str]
+    workspace_created: bool
+    lock_info: Optional[Dict]
+    lock_acquired: Optional[bool]  # None when no lock was attempted
+
 
 def run_git_command(cmd, cwd=None):
     """Run git command with explicit directory specification."""
@@ -43,26 +66,72 @@ class MAOSBackend:
         
         # File lock managers per session (lazy-loaded)
         self._lock_managers: Dict[str, MAOSFileLockManager] = {}
+        
+        # Parsed coordination files; mutations are queued in one write batch
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._batch = WriteBatch()
+        atexit.register(self.flush)
+    
+    def _load(self, path: Path) -> Dict[str, Any]:
+        """Load a coordination file once and serve later reads from memory"""
+        key = str(path)
+        if key not in self._cache:
+            try:
+                self._cache[key] = load_json_file(path)
+            except (FileNotFoundError, JSONDecodeError):
+                self._cache[key] = {}
+        return self._cache[key]
+    
+    def _store(self, path: Path, data: Dict[str, Any]):
+        """Replace cached contents of a coordination file"""
+        self._cache[str(path)] = data
+        self._mark_dirty(path)
+    
+    def _mark_dirty(self, path: Path):
+        """Schedule a cached coordination file for write-back"""
+        self._batch.set(path, self._cache[str(path)])
+    
+    def flush(self):
+        """Write all queued coordination state to disk in one pass.
+        
+        Parsed files are dropped afterwards, so a backend kept for the next
+        hook call re-reads whatever other agents changed in the meantime.
+        """
+        if self._batch:
+            for log_path, log_size in self._batch.commit().items():
+                if log_size > PROGRESS_COMPACT_BYTES and log_path.endswith("progress.jsonl"):
+                    self.compact_progress(Path(log_path).parent.name)
+        
+        self._cache.clear()
+    
+    def _session_exists(self, session_id: str) -> bool:
+        """Whether session_id's session.json is on disk or queued in this backend.
+        
+        Checked on every call rather than remembered: a long-lived backend
+        (hook daemon, --server) can outlive a session directory that was
+        cleaned up underneath it.
+        """
+        session_file = self.sessions_dir / session_id / "session.json"
+        return str(session_file) in self._cache or session_file.exists()
     
     def get_or_create_session(self, hook_metadata: Optional[Dict] = None) -> str:
         """Get active session ID or create new one"""
         # Try to get from hook metadata first
         if hook_metadata and hook_metadata.get('session_id'):
             session_id = hook_metadata['session_id']
+            
+            # Existing session - nothing to initialize, just keep it active
+            if self._session_exists(session_id):
+                self._set_active_session(session_id)
+                return session_id
         else:
-            # Check for active session
-            active_file = self.maos_dir / "active_session.json"
-            if active_file.exists():
-                try:
-                    with open(active_file) as f:
-                        session_id = json.load(f).get('session_id')
-                        if session_id:
-                            return session_id
-                except (json.JSONDecodeError, KeyError):
-                    pass
+            # Check for active session (re-initialized below if its directory is gone)
+            session_id = self._load(self.maos_dir / "active_session.json").get('session_id')
+            if session_id and self._session_exists(session_id):
+                return session_id
             
             # Create new session
-            session_id = f"sess-{int(time.time())}"
+            session_id = session_id or f"sess-{int(time.time())}"
         
         # Initialize session
         self.init_session(session_id, hook_metadata)
@@ -71,6 +140,13 @@ class MAOSBackend:
     def init_session(self, session_id: str, hook_metadata: Optional[Dict] = None):
         """Initialize a new MAOS session"""
         session_dir = self.sessions_dir / session_id
+        
+        # Managers and log descriptors cached for an earlier session of this ID
+        # point at a removed directory
+        self._state_managers.pop(session_id, None)
+        self._lock_managers.pop(session_id, None)
+        close_logs_under(session_dir)
+        
         session_dir.mkdir(parents=True, exist_ok=True)
         
         session_data = {
@@ -81,15 +157,19 @@ class MAOSBackend:
         }
         
         # Write session data
-        with open(session_dir / "session.json", 'w') as f:
-            json.dump(session_data, f, indent=2)
+        self._store(session_dir / "session.json", session_data)
         
         # Initialize directory-based state manager (modern atomic operations)
         state_manager = self._get_state_manager(session_id)
         
         # Update active session pointer
-        with open(self.maos_dir / "active_session.json", 'w') as f:
-            json.dump({"session_id": session_id}, f, indent=2)
+        self._set_active_session(session_id)
+    
+    def _set_active_session(self, session_id: str):
+        """Point active_session.json at session_id (written only on change)"""
+        active_file = self.maos_dir / "active_session.json"
+        if self._load(active_file).get('session_id') != session_id:
+            self._store(active_file, {"session_id": session_id})
     
     def _get_state_manager(self, session_id: str) -> MAOSStateManager:
         """Get or create state manager for session (lazy loading)"""
@@ -120,48 +200,40 @@ class MAOSBackend:
         
         return agent_id
     
+    @staticmethod
+    def _agent_info(state: str, agent: Dict) -> Optional[Dict]:
+        """Shape a pending/active agent record for hook consumers"""
+        if state not in ("pending", "active"):
+            return None
+        
+        return {
+            "type": agent.get("agent_type"),
+            "session": agent.get("session_id"),
+            "registered_at": agent.get("timestamp"),
+            "workspace_created": state == "active",
+            "workspace_path": agent.get("workspace_path") if state == "active" else None,
+            "status": state
+        }
+    
     def get_agent_info(self, agent_id: str, session_id: str) -> Optional[Dict]:
         """Get information about a pending or active agent using atomic directory operations"""
-        state_manager = self._get_state_manager(session_id)
-        
-        # Check current state
-        state = state_manager.get_agent_state(agent_id)
-        if not state:
+        record = self._get_state_manager(session_id).get_agent_record(agent_id)
+        if not record:
             return None
         
-        # Get agent data based on state
-        if state == "pending":
-            pending_agents = state_manager.get_pending_agents()
-            for agent in pending_agents:
-                if agent.get("agent_id") == agent_id:
-                    return {
-                        "type": agent.get("agent_type"),
-                        "session": agent.get("session_id"),
-                        "registered_at": agent.get("timestamp"),
-                        "workspace_created": False,
-                        "workspace_path": None,
-                        "status": "pending"
-                    }
-        elif state == "active":
-            active_agents = state_manager.get_active_agents()
-            for agent in active_agents:
-                if agent.get("agent_id") == agent_id:
-                    return {
-                        "type": agent.get("agent_type"),
-                        "session": agent.get("session_id"),
-                        "registered_at": agent.get("timestamp"),
-                        "workspace_created": True,
-                        "workspace_path": agent.get("workspace_path"),
-                        "status": "active"
-                    }
-        
-        return None
+        return self._agent_info(*record)
     
     def create_workspace_if_needed(self, agent_id: str, session_id: str) -> Optional[str]:
         """Create workspace for agent if not already created using atomic state transitions"""
         state_manager = self._get_state_manager(session_id)
-        agent_info = self.get_agent_info(agent_id, session_id)
         
+        # Load the agent record once and reuse it for the transition
+        record = state_manager.get_agent_record(agent_id)
+        if not record:
+            return None
+        
+        state, agent_data = record
+        agent_info = self._agent_info(state, agent_data)
         if not agent_info:
             return None
         
@@ -174,7 +246,7 @@ class MAOSBackend:
         workspace_path = self.prepare_workspace(agent_type, session_id)
         
         # Atomically transition from pending to active
-        success = state_manager.transition_to_active(agent_id, workspace_path)
+        success = state_manager.transition_to_active(agent_id, workspace_path, agent_data)
         if success:
             return workspace_path
         else:
@@ -190,7 +262,7 @@ class MAOSBackend:
         try:
             # Create worktree using our git wrapper
             result = run_git_command([
-                "worktree", "add", "-b", branch, str(workspace)
+                "worktree", "add", "--quiet", "-b", branch, str(workspace)
             ])
             if result.returncode != 0:
                 raise subprocess.CalledProcessError(result.returncode, result.args, result.stdout, result.stderr)
@@ -206,7 +278,7 @@ class MAOSBackend:
             # Try without -b flag in case branch exists
             try:
                 result = run_git_command([
-                    "worktree", "add", str(workspace), branch
+                    "worktree", "add", "--quiet", str(workspace), branch
                 ])
                 if result.returncode != 0:
                     raise subprocess.CalledProcessError(result.returncode, result.args)
@@ -225,7 +297,7 @@ class MAOSBackend:
                     branch = f"agent/session-{session_id}/{agent_type}-{timestamp}"
                     
                     result = run_git_command([
-                        "worktree", "add", "-b", branch, str(workspace)
+                        "worktree", "add", "--quiet", "-b", branch, str(workspace)
                     ])
                     if result.returncode != 0:
                         raise subprocess.CalledProcessError(result.returncode, result.args)
@@ -248,24 +320,59 @@ class MAOSBackend:
                     self.register_agent(agent_type, session_id, str(workspace))
                     return str(workspace)
     
+    def prepare_workspaces(self, agent_types: List[str], session_id: str) -> Dict[str, str]:
+        """Create git worktrees for several agents concurrently"""
+        agent_types = list(dict.fromkeys(agent_types))  # One worktree per type
+        if not agent_types:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(len(agent_types), MAX_GIT_WORKERS)) as executor:
+            workspaces = executor.map(lambda agent_type: self.prepare_workspace(agent_type, session_id), agent_types)
+            return dict(zip(agent_types, workspaces))
+    
     def register_agent(self, agent_type: str, session_id: str, workspace: str):
         """Legacy method - replaced by atomic directory operations"""
         # This method is deprecated - modern code uses state_manager.transition_to_active()
         pass
     
+    def prepare_file_op(self, agent_id: str, session_id: str, file_path: str, tool_name: str,
+                        needs_workspace: bool) -> FileOpContext:
+        """Resolve agent state, create its workspace if due and take the file lock in one call"""
+        record = self._get_state_manager(session_id).get_agent_record(agent_id)
+        agent_state, agent_data = record if record else (None, {})
+        
+        workspace_path = agent_data.get("workspace_path") if agent_state == "active" else None
+        workspace_created = False
+        if agent_state == "pending" and needs_workspace:
+            # Lazily create the workspace only for file modification tools
+            workspace_path = self.create_workspace_if_needed(agent_id, session_id)
+            workspace_created = bool(workspace_path)
+        
+        lock_info = None
+        lock_acquired = None
+        if needs_workspace:
+            if tool_name in FILE_LOCK_TOOLS:
+                # One atomic attempt; a conflict reports the current holder
+                lock_acquired, lock_info = self.acquire_file_lock(file_path, agent_id, session_id, tool_name)
+            else:
+                lock_info = self.check_file_lock(file_path, session_id, agent_id)
+        
+        return FileOpContext(agent_state, workspace_path, workspace_created, lock_info, lock_acquired)
+    
     def check_file_lock(self, file_path: str, session_id: str, requesting_agent: str = "") -> Optional[Dict]:
         """Check if file is locked by another agent using atomic directory operations"""
-        lock_manager = self._get_lock_manager(session_id)
+        lock_info = self._get_lock_manager(session_id).get_lock_info(file_path)
         
-        if lock_manager.is_locked(file_path, requesting_agent):
-            return lock_manager.get_lock_info(file_path)
+        # Not locked if same agent owns it
+        if lock_info and lock_info.get("agent_id") != requesting_agent:
+            return lock_info
         
         return None
     
-    def acquire_file_lock(self, file_path: str, agent_id: str, session_id: str, operation: str, timeout: float = 5.0) -> bool:
-        """Acquire file lock using atomic directory operations"""
+    def acquire_file_lock(self, file_path: str, agent_id: str, session_id: str, operation: str) -> Tuple[bool, Optional[Dict]]:
+        """Try once to acquire a file lock; returns (acquired, existing holder's info)"""
         lock_manager = self._get_lock_manager(session_id)
-        return lock_manager.acquire_lock(agent_id, file_path, operation, timeout)
+        return lock_manager.try_acquire_lock(agent_id, file_path, operation)
     
     def release_file_lock(self, file_path: str, agent_id: str, session_id: str) -> bool:
         """Release file lock using atomic directory operations"""
@@ -273,39 +380,109 @@ class MAOSBackend:
         return lock_manager.release_lock(agent_id, file_path)
     
     def update_progress(self, agent_type: str, session_id: str, operation: str, details: Optional[Dict] = None):
-        """Update agent progress tracking using JSONL append-only logs"""
-        # Modern progress tracking via lifecycle events in state manager
-        state_manager = self._get_state_manager(session_id)
-        state_manager._log_lifecycle_event("progress_update", f"unknown-{agent_type}", agent_type, {
-            "operation": operation,
+        """Queue one progress record for the session's progress.jsonl"""
+        record = {
+            "agent": agent_type,
+            "op": operation,
+            "ts_ns": time.time_ns(),
             "details": details or {}
+        }
+        
+        # Appended on flush - no read/modify/write of prior progress
+        self._batch.append_jsonl(self.sessions_dir / session_id / "progress.jsonl", record)
+    
+    def record_activity(self, session_id: str, tool_name: str, total_operations: int):
+        """Queue the session's activity.json snapshot, replacing the previous one"""
+        self._store(self.sessions_dir / session_id / "activity.json", {
+            'last_activity': datetime.now().isoformat(),
+            'last_tool': tool_name,
+            'total_operations': total_operations
         })
     
+    @staticmethod
+    def _fold_progress(summary: Dict[str, Any], log_file: Path):
+        """Fold JSONL progress records into per-agent summary entries"""
+        try:
+            with open(log_file, 'rb') as f:
+                for line in f:
+                    try:
+                        record = loads(line)
+                    except JSONDecodeError:
+                        continue  # Torn or partial line
+                    
+                    agent = summary.setdefault(record.get("agent", "unknown"), {
+                        "operations": 0,
+                        "by_operation": {}
+                    })
+                    op = record.get("op")
+                    agent["operations"] += 1
+                    agent["by_operation"][op] = agent["by_operation"].get(op, 0) + 1
+                    agent["last_operation"] = op
+                    agent["last_update_ns"] = record.get("ts_ns")
+                    agent["last_details"] = record.get("details", {})
+        except FileNotFoundError:
+            pass
+    
+    def get_progress(self, session_id: str) -> Dict[str, Any]:
+        """Get per-agent progress from the compacted summary plus the live log"""
+        session_dir = self.sessions_dir / session_id
+        try:
+            summary = load_json_file(session_dir / "progress.json")
+        except (FileNotFoundError, JSONDecodeError):
+            summary = {}
+        
+        self._fold_progress(summary, session_dir / "progress.jsonl")
+        
+        # Timestamps are stored raw; format them only for readers
+        for agent in summary.values():
+            if agent.get("last_update_ns"):
+                agent["last_update"] = format_ts(agent["last_update_ns"])
+        return summary
+    
+    def compact_progress(self, session_id: str):
+        """Fold progress.jsonl into progress.json and start a fresh log"""
+        session_dir = self.sessions_dir / session_id
+        
+        # Claim the current log atomically; writers recreate progress.jsonl on next append
+        claimed = session_dir / f"progress.jsonl.{os.getpid()}.compacting"
+        try:
+            os.replace(session_dir / "progress.jsonl", claimed)
+        except FileNotFoundError:
+            return  # Another process already compacted it
+        
+        summary_file = session_dir / "progress.json"
+        try:
+            summary = load_json_file(summary_file)
+        except (FileNotFoundError, JSONDecodeError):
+            summary = {}
+        
+        self._fold_progress(summary, claimed)
+        
+        atomic_write_json(summary_file, summary, indent=False)
+        claimed.unlink()
+    
     def cleanup_completed_worktrees(self):
         """Remove completed worktrees that have no uncommitted changes"""
         if not self.worktrees_dir.exists():
             return
         
-        for worktree in self.worktrees_dir.iterdir():
-            if worktree.is_dir():
-                try:
-                    # Check if worktree has uncommitted changes
-                    result = run_git_command(
-                        ["diff", "--quiet"], cwd=worktree
-                    )
-                    
-                    # Also check staged changes
-                    staged_result = run_git_command(
-                        ["diff", "--cached", "--quiet"], cwd=worktree
-                    )
-                    
-                    # If no uncommitted changes, safe to remove
-                    if result.returncode == 0 and staged_result.returncode == 0:
-                        run_git_command(["worktree", "remove", str(worktree)])
-                        
-                except subprocess.CalledProcessError:
-                    # Skip worktrees we can't check
-                    continue
+        worktrees = [w for w in self.worktrees_dir.iterdir() if w.is_dir()]
+        if not worktrees:
+            return
+        
+        def is_clean(worktree: Path) -> bool:
+            # One status call covers unstaged, staged and untracked changes
+            result = run_git_command(["status", "--porcelain"], cwd=worktree)
+            return result.returncode == 0 and not result.stdout.strip()
+        
+        with ThreadPoolExecutor(max_workers=MAX_GIT_WORKERS) as executor:
+            clean = [w for w, ok in zip(worktrees, executor.map(is_clean, worktrees)) if ok]
+            
+            # Remove the clean ones concurrently as well
+            list(executor.map(
+                lambda w: run_git_command(["worktree", "remove", str(w)]),
+                clean
+            ))
     
     def get_session_status(self, session_id: str) -> Optional[Dict]:
         """Get current session status and agent information"""
@@ -317,45 +494,91 @@ class MAOSBackend:
         
         # Load session data
         session_file = session_dir / "session.json"
-        if session_file.exists():
-            try:
-                with open(session_file) as f:
-                    status['session'] = json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                status['session'] = {}
+        if session_file.exists() or str(session_file) in self._cache:
+            status['session'] = self._load(session_file)
         
         # Modern atomic directory-based state
         state_manager = self._get_state_manager(session_id)
         status['state'] = state_manager.get_state_summary()
         status['pending_agents'] = state_manager.get_pending_agents()
         status['active_agents'] = state_manager.get_active_agents()
+        status['locks'] = [
+            {**lock, "acquired_at": format_ts(lock["acquired_ns"])} if lock.get("acquired_ns") else lock
+            for lock in self._get_lock_manager(session_id).get_all_locks()
+        ]
+        status['progress'] = self.get_progress(session_id)
         
         return status
 
 
 # Utility functions for hooks
+_BACKEND: Optional[MAOSBackend] = None
+
+
 def get_backend() -> MAOSBackend:
-    """Get MAOS backend instance"""
-    return MAOSBackend()
+    """Get the process-wide MAOS backend instance, created on first use"""
+    global _BACKEND
+    if _BACKEND is None:
+        _BACKEND = MAOSBackend()
+    return _BACKEND
 
 
 def extract_file_path_from_tool_input(tool_input: Dict) -> Optional[str]:
-    """Extract file path from various tool inputs"""
-    # Direct file_path parameter
-    if 'file_path' in tool_input:
-        return tool_input['file_path']
-    
-    # MultiEdit edits (take first one)
-    if 'edits' in tool_input and tool_input['edits']:
-        return tool_input.get('file_path')
-    
-    return None
+    """Extract file path from various tool inputs (Edit, Write, MultiEdit and Read all use file_path)"""
+    return tool_input.get('file_path')
 
 
 # extract_agent_id_from_environment() function removed - replaced with hook context matching
 # to eliminate race conditions in multi-agent environments
 
 
+def handle_server_request(backend: MAOSBackend, request: Dict) -> Dict:
+    """Run one --server request; mirrors the status, cleanup and test-workspace(s) commands"""
+    op = request.get('op')
+    
+    if op == "status":
+        session_id = request.get('session_id') or backend._load(MAOS_DIR / "active_session.json").get('session_id')
+        status = backend.get_session_status(session_id) if session_id else None
+        if status is None:
+            return {'ok': False, 'error': f"Session {session_id} not found" if session_id else "No active session found"}
+        return {'ok': True, 'status': status}
+    
+    if op == "cleanup":
+        backend.cleanup_completed_worktrees()
+        return {'ok': True}
+    
+    if op == "test-workspace":
+        session_id = backend.get_or_create_session()
+        return {'ok': True, 'workspace': backend.prepare_workspace(request['agent'], session_id), 'session_id': session_id}
+    
+    if op == "test-workspaces":
+        session_id = backend.get_or_create_session()
+        return {'ok': True, 'workspaces': backend.prepare_workspaces(request['agents'], session_id), 'session_id': session_id}
+    
+    return {'ok': False, 'error': f"Unknown op: {op}"}
+
+
+def serve(backend: MAOSBackend):
+    """Answer newline-delimited JSON requests on stdin with one JSON line each on stdout.
+    
+    Lets a test driver pay for interpreter startup and imports once instead of
+    once per command. State is flushed after every request, so other processes
+    see it immediately.
+    """
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = handle_server_request(backend, loads(line))
+        except Exception as e:
+            response = {'ok': False, 'error': str(e)}
+        finally:
+            backend.flush()
+        
+        sys.stdout.write(dumps(response).decode() + "\n")
+        sys.stdout.flush()
+
+
 if __name__ == '__main__':
     # CLI for testing backend utilities
     import sys
@@ -366,6 +589,8 @@ if __name__ == '__main__':
         print("  status [session_id]  - Show session status")
         print("  cleanup              - Clean up completed worktrees")
         print("  test-workspace <agent_type> - Test workspace creation")
+        print("  test-workspaces <agent_type>... - Test parallel workspace creation")
+        print("  --server             - Serve JSON-line requests on stdin (op: status, cleanup, test-workspace, test-workspaces)")
         sys.exit(1)
     
     backend = MAOSBackend()
@@ -375,15 +600,12 @@ if __name__ == '__main__':
         session_id = sys.argv[2] if len(sys.argv) > 2 else None
         if not session_id:
             # Get active session
-            active_file = MAOS_DIR / "active_session.json"
-            if active_file.exists():
-                with open(active_file) as f:
-                    session_id = json.load(f).get('session_id')
+            session_id = backend._load(MAOS_DIR / "active_session.json").get('session_id')
         
         if session_id:
             status = backend.get_session_status(session_id)
             if status:
-                print(json.dumps(status, indent=2))
+                print(dumps(status, indent=True).decode(), end='')
             else:
                 print(f"Session {session_id} not found")
         else:
@@ -404,6 +626,19 @@ if __name__ == '__main__':
         print(f"Created workspace: {workspace}")
         print(f"Session: {session_id}")
     
+    elif command == "test-workspaces":
+        if len(sys.argv) < 3:
+            print("Usage: python maos_backend.py test-workspaces <agent_type>...")
+            sys.exit(1)
+        
+        session_id = backend.get_or_create_session()
+        for workspace in backend.prepare_workspaces(sys.argv[2:], session_id).values():
+            print(f"Created workspace: {workspace}")
+        print(f"Session: {session_id}")
+    
+    elif command == "--server":
+        serve(backend)
+    
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
@@ -4,8 +4,10 @@
 # ///
 
 import json
+from functools import lru_cache
 from pathlib import Path
-from .path_utils import MAOS_HOOKS_DIR
+from .json_utils import atomic_write_json
+from .path_utils import MAOS_HOOKS_DIR, find_git_root
 
 # Constants for config file location
 CONFIG_DIR_COMPONENTS = (".claude", "hooks", "maos")
@@ -29,21 +31,11 @@ def get_config_path():
     if _config_path_cache is not _CACHE_SENTINEL:
         return _config_path_cache
     
-    import subprocess
-    
-    # Try to find git root first (most reliable for Claude Code)
-    try:
-        git_root = subprocess.check_output(
-            ['git', 'rev-parse', '--show-toplevel'],
-            stderr=subprocess.DEVNULL,
-            text=True
-        ).strip()
-        config_path = Path(git_root).joinpath(*CONFIG_DIR_COMPONENTS, CONFIG_FILENAME)
-        if config_path.exists():
-            _config_path_cache = config_path
-            return config_path
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        pass
+    # Try git root first (most reliable for Claude Code)
+    config_path = find_git_root().joinpath(*CONFIG_DIR_COMPONENTS, CONFIG_FILENAME)
+    if config_path.exists():
+        _config_path_cache = config_path
+        return config_path
     
     # Look for config in .claude directory relative to current working directory
     config_path = Path.cwd().joinpath(*CONFIG_DIR_COMPONENTS, CONFIG_FILENAME)
@@ -149,10 +141,18 @@ def merge_configs(default, user):
     return result
 
 def clear_config_cache():
-    """Clear the cached config path and loaded config."""
+    """Clear the cached config path, loaded config and derived TTS settings."""
     global _config_path_cache, _config_cache
     _config_path_cache = _CACHE_SENTINEL
     _config_cache = _CACHE_SENTINEL
+    _clear_derived_caches()
+
+def _clear_derived_caches():
+    """Forget TTS settings computed from the previously loaded config."""
+    is_response_tts_enabled.cache_clear()
+    is_completion_tts_enabled.cache_clear()
+    is_notification_tts_enabled.cache_clear()
+    get_active_tts_provider.cache_clear()
 
 def save_config(config):
     """Save configuration to config.json and clear cache."""
@@ -166,10 +166,10 @@ def save_config(config):
         config_path = config_dir / CONFIG_FILENAME
     
     try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        atomic_write_json(config_path, config)
         # Clear cache after successful save
         _config_cache = _CACHE_SENTINEL
+        _clear_derived_caches()
         return True
     except (OSError, json.JSONDecodeError):
         return False
@@ -183,6 +183,7 @@ def is_tts_enabled():
     """Check if TTS master switch is enabled."""
     return get_tts_config().get('enabled', True)
 
+@lru_cache(maxsize=1)
 def is_response_tts_enabled():
     """Check if response TTS is enabled (master switch AND responses.enabled)."""
     tts_config = get_tts_config()
@@ -192,6 +193,7 @@ def is_response_tts_enabled():
     responses_enabled = tts_config.get('responses', {}).get('enabled', False)
     return responses_enabled
 
+@lru_cache(maxsize=1)
 def is_completion_tts_enabled():
     """Check if completion TTS is enabled (master switch AND completion.enabled)."""
     tts_config = get_tts_config()
@@ -201,6 +203,7 @@ def is_completion_tts_enabled():
     completion_enabled = tts_config.get('completion', {}).get('enabled', True)
     return completion_enabled
 
+@lru_cache(maxsize=1)
 def is_notification_tts_enabled():
     """Check if notification TTS is enabled (master switch AND notifications.enabled)."""
     tts_config = get_tts_config()
@@ -248,10 +251,12 @@ def get_api_key(provider):
         
     return None
 
+@lru_cache(maxsize=1)
 def get_active_tts_provider():
     """Get the active TTS provider based on config and API key availability.
     
     Respects user's configured provider but falls back gracefully if API keys unavailable.
+    Cached per process, so load any .env holding API keys before the first call.
     """
     provider = get_tts_provider()
     
@@ -7,11 +7,17 @@ Each lock is a directory with agent metadata - atomic creation/deletion ensures
 
 import json
 import hashlib
+import os
 import time
 from pathlib import Path
-from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Any
-from .async_logging import log_hook_data
+from typing import Dict, Optional, List, Any, Tuple
+from .jsonl_log import log_hook_data_sync
+from .json_utils import atomic_write_json
+from .path_utils import find_git_root
+
+# A lock directory without metadata is only treated as abandoned after this long,
+# so a lock that is still writing its metadata is never reclaimed
+LOCK_METADATA_GRACE_SECONDS = 2.0
 
 
 class MAOSFileLockManager:
@@ -34,17 +40,7 @@ class MAOSFileLockManager:
     
     def _get_project_root(self) -> Path:
         """Get project root using git or current working directory"""
-        try:
-            import subprocess
-            root = subprocess.check_output(
-                ['git', 'rev-parse', '--show-toplevel'],
-                stderr=subprocess.DEVNULL,
-                text=True
-            ).strip()
-            return Path(root)
-        except Exception:
-            # Fall back to current working directory
-            return Path.cwd()
+        return find_git_root()
     
     def _hash_path_to_lock_key(self, file_path: str) -> str:
         """Convert file path to lock key using SHA-256 hash (safe for filesystem, guaranteed unique)"""
@@ -53,53 +49,73 @@ class MAOSFileLockManager:
         safe_key = hash_obj.hexdigest()
         return safe_key
     
-    def acquire_lock(self, agent_id: str, file_path: str, operation: str, timeout_seconds: float = 5.0) -> bool:
+    def try_acquire_lock(self, agent_id: str, file_path: str, operation: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
-        Attempt to acquire lock on file path.
+        Make one non-blocking attempt to lock file path.
         
-        Returns True if lock acquired, False if timeout or conflict.
-        Uses atomic directory creation - no race conditions possible.
+        Returns (True, None) if the lock was taken or is already held by agent_id,
+        or (False, holder_metadata) if another agent holds it. The atomic mkdir is
+        both the check and the acquisition, so there is no window between them.
         """
         lock_key = self._hash_path_to_lock_key(file_path)
         lock_dir = self.locks_dir / f"{lock_key}.lock"
         
-        start_time = time.time()
-        
-        while (time.time() - start_time) < timeout_seconds:
+        for _ in range(2):  # Second pass only after reclaiming a stale lock
             try:
                 # Atomic lock acquisition using directory creation
                 lock_dir.mkdir(exist_ok=False)  # Fails if directory exists
+            except FileExistsError:
+                lock_info = self.get_lock_info(file_path)
                 
-                # Lock acquired successfully - write metadata
-                lock_metadata = {
-                    "agent_id": agent_id,
-                    "file_path": file_path,
-                    "operation": operation,
-                    "acquired_at": datetime.utcnow().isoformat(),
-                    "session_id": self.session_id
-                }
-                
-                with open(lock_dir / "metadata.json", 'w') as f:
-                    json.dump(lock_metadata, f, indent=2)
-                
-                # Log successful lock acquisition
-                self._log_lock_event("lock_acquired", agent_id, file_path, {
-                    "operation": operation,
-                    "timeout_seconds": timeout_seconds
-                })
+                # Re-entrant: the holder may lock the same file again
+                if lock_info and lock_info.get("agent_id") == agent_id:
+                    return True, None
                 
-                return True
-                
-            except FileExistsError:
-                # Lock held by another agent - check if it's stale
-                if self._is_stale_lock(lock_dir):
+                if self._is_stale_lock(lock_dir, lock_metadata=lock_info):
                     # Clean up stale lock and retry
                     self._force_release_lock(file_path, "stale_lock_cleanup")
                     continue
                 
-                # Valid lock exists - wait and retry
-                time.sleep(0.01)  # 10ms backoff
-                continue
+                # Metadata may still be in flight; report the holder as unknown
+                return False, lock_info or {"agent_id": "unknown", "operation": "unknown"}
+            
+            # Lock acquired successfully - write metadata
+            lock_metadata = {
+                "agent_id": agent_id,
+                "file_path": file_path,
+                "operation": operation,
+                "acquired_ns": time.time_ns(),
+                "session_id": self.session_id
+            }
+            
+            # Publish metadata atomically so readers never see a partial file
+            atomic_write_json(lock_dir / "metadata.json", lock_metadata, indent=False)
+            
+            # Log successful lock acquisition
+            self._log_lock_event("lock_acquired", agent_id, file_path, {
+                "operation": operation
+            })
+            
+            return True, None
+        
+        return False, self.get_lock_info(file_path)
+    
+    def acquire_lock(self, agent_id: str, file_path: str, operation: str, timeout_seconds: float = 5.0) -> bool:
+        """
+        Attempt to acquire lock on file path, waiting up to timeout_seconds.
+        
+        Returns True if lock acquired, False if timeout or conflict.
+        Uses atomic directory creation - no race conditions possible.
+        """
+        start_time = time.time()
+        
+        while (time.time() - start_time) < timeout_seconds:
+            acquired, _ = self.try_acquire_lock(agent_id, file_path, operation)
+            if acquired:
+                return True
+            
+            # Valid lock exists - wait and retry
+            time.sleep(0.01)  # 10ms backoff
         
         # Timeout reached
         self._log_lock_event("lock_timeout", agent_id, file_path, {
@@ -117,17 +133,16 @@ class MAOSFileLockManager:
         lock_key = self._hash_path_to_lock_key(file_path)
         lock_dir = self.locks_dir / f"{lock_key}.lock"
         
-        if not lock_dir.exists():
-            # No lock exists
-            return True
-        
         try:
-            # Check lock ownership
-            metadata_file = lock_dir / "metadata.json"
-            if metadata_file.exists():
-                with open(metadata_file, 'r') as f:
+            # Check lock ownership with one read; the directory is only stat'ed when metadata is missing
+            try:
+                with open(lock_dir / "metadata.json", 'r') as f:
                     lock_metadata = json.load(f)
-                
+            except FileNotFoundError:
+                if not lock_dir.exists():
+                    # No lock exists
+                    return True
+            else:
                 if lock_metadata.get("agent_id") != agent_id:
                     # Lock not owned by this agent
                     return False
@@ -161,9 +176,10 @@ class MAOSFileLockManager:
         """Safely remove lock directory and contents"""
         try:
             # Remove metadata file first
-            metadata_file = lock_dir / "metadata.json"
-            if metadata_file.exists():
-                metadata_file.unlink()
+            try:
+                (lock_dir / "metadata.json").unlink()
+            except FileNotFoundError:
+                pass
             
             # Remove directory
             lock_dir.rmdir()
@@ -173,66 +189,48 @@ class MAOSFileLockManager:
             import shutil
             shutil.rmtree(lock_dir, ignore_errors=True)
     
-    def _is_stale_lock(self, lock_dir: Path, max_age_minutes: int = 30) -> bool:
-        """Check if lock is stale (too old)"""
+    def _is_stale_lock(self, lock_dir: Path, max_age_minutes: int = 30,
+                       lock_metadata: Optional[Dict[str, Any]] = None) -> bool:
+        """Check if lock is stale (too old); lock_metadata skips re-reading metadata the caller already has"""
         try:
-            metadata_file = lock_dir / "metadata.json"
-            if not metadata_file.exists():
-                return True  # Lock without metadata is stale
-            
-            with open(metadata_file, 'r') as f:
-                lock_metadata = json.load(f)
-            
-            acquired_at = datetime.fromisoformat(lock_metadata.get("acquired_at", ""))
-            age = datetime.utcnow() - acquired_at
+            if lock_metadata is None:
+                with open(lock_dir / "metadata.json", 'r') as f:
+                    lock_metadata = json.load(f)
+        except FileNotFoundError:
+            # Lock without metadata is stale once its holder had time to write it
+            try:
+                return time.time() - lock_dir.stat().st_mtime > LOCK_METADATA_GRACE_SECONDS
+            except FileNotFoundError:
+                return False  # Released meanwhile
+        except Exception:
+            return True  # Malformed lock is stale
+        
+        try:
+            age_ns = time.time_ns() - int(lock_metadata["acquired_ns"])
             
-            return age > timedelta(minutes=max_age_minutes)
+            return age_ns > max_age_minutes * 60 * 1_000_000_000
             
         except Exception:
             return True  # Malformed lock is stale
     
     def is_locked(self, file_path: str, requesting_agent: str) -> bool:
         """Check if file is locked by another agent"""
-        lock_key = self._hash_path_to_lock_key(file_path)
-        lock_dir = self.locks_dir / f"{lock_key}.lock"
-        
-        if not lock_dir.exists():
+        lock_metadata = self.get_lock_info(file_path)
+        if not lock_metadata:
             return False
         
-        try:
-            metadata_file = lock_dir / "metadata.json"
-            if not metadata_file.exists():
-                return False
-            
-            with open(metadata_file, 'r') as f:
-                lock_metadata = json.load(f)
-            
-            lock_owner = lock_metadata.get("agent_id")
-            
-            # Not locked if same agent owns it
-            return lock_owner != requesting_agent
-            
-        except Exception:
-            # Malformed lock - consider it not locked
-            return False
+        # Not locked if same agent owns it
+        return lock_metadata.get("agent_id") != requesting_agent
     
     def get_lock_info(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """Get information about current lock on file"""
+        """Get information about current lock on file (single small file read)"""
         lock_key = self._hash_path_to_lock_key(file_path)
-        lock_dir = self.locks_dir / f"{lock_key}.lock"
-        
-        if not lock_dir.exists():
-            return None
         
         try:
-            metadata_file = lock_dir / "metadata.json"
-            if not metadata_file.exists():
-                return None
-            
-            with open(metadata_file, 'r') as f:
+            with open(self.locks_dir / f"{lock_key}.lock" / "metadata.json", 'r') as f:
                 return json.load(f)
-                
         except Exception:
+            # No lock, or lock still being written / malformed
             return None
     
     def release_all_agent_locks(self, agent_id: str) -> List[str]:
@@ -241,11 +239,8 @@ class MAOSFileLockManager:
         
         for lock_dir in self.locks_dir.glob("*.lock"):
             try:
-                metadata_file = lock_dir / "metadata.json"
-                if not metadata_file.exists():
-                    continue
-                
-                with open(metadata_file, 'r') as f:
+                # A lock without metadata raises here and is skipped
+                with open(lock_dir / "metadata.json", 'r') as f:
                     lock_metadata = json.load(f)
                 
                 if lock_metadata.get("agent_id") == agent_id:
@@ -307,33 +302,21 @@ class MAOSFileLockManager:
             "details": details
         }
         
-        # Use unified async logging system
-        try:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                loop.create_task(log_hook_data(self.session_path / "file_locks.jsonl", log_data))
-            else:
-                asyncio.run(log_hook_data(self.session_path / "file_locks.jsonl", log_data))
-        except Exception:
-            # Fallback to synchronous logging
-            import json
-            with open(self.session_path / "file_locks.jsonl", 'a') as f:
-                json.dump({**log_data, "timestamp": datetime.utcnow().isoformat()}, f)
-                f.write('\n')
+        # One O_APPEND write; an event loop per event would cost more than the write
+        log_hook_data_sync(self.session_path / "file_locks.jsonl", log_data)
     
     def get_all_locks(self) -> List[Dict[str, Any]]:
         """Get information about all current locks"""
         locks = []
         
-        for lock_dir in self.locks_dir.glob("*.lock"):
-            try:
-                metadata_file = lock_dir / "metadata.json"
-                if metadata_file.exists():
-                    with open(metadata_file, 'r') as f:
-                        lock_metadata = json.load(f)
-                    locks.append(lock_metadata)
-            except Exception:
-                continue
+        with os.scandir(self.locks_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".lock"):
+                    continue
+                try:
+                    with open(os.path.join(entry.path, "metadata.json"), 'r') as f:
+                        locks.append(json.load(f))
+                except Exception:
+                    continue
         
-        return locks
\ No newline at end of file
+        return locks
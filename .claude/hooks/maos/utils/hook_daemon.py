@@ -0,0 +1,295 @@
+"""
+Opt-in warm hook daemon for the tool-use hooks.
+
+With MAOS_HOOK_DAEMON=1 in the environment, pre_tool_use.py and
+post_tool_use.py forward their stdin to a long-lived process over a unix
+socket instead of importing the MAOS handlers themselves. The daemon keeps
+the hook modules imported, runs each request's main() in-process and sends
+back the exit code and stderr text, which the hook replays.
+
+Protocol (one request per connection):
+    client -> daemon: b"<hook name>\\n" + raw stdin bytes, then SHUT_WR
+    daemon -> client: one exit-code byte + stderr bytes, then close
+
+The first hook that finds no daemon starts one in the background and runs
+in-process itself. A hook only falls back to running in-process when it
+cannot connect; once a request is sent, a daemon that fails to answer is
+treated as a non-blocking failure rather than run twice.
+
+The daemon serves one project root and exits after DAEMON_IDLE_SECONDS
+without requests, so edits to the hook code are picked up after an idle
+period or by killing it. Its socket and lock live in a 0700 directory
+owned by the current user (.maos/run), which clients verify before
+connecting, so no other user can stand in for the daemon.
+
+Run directly with:  PYTHONPATH=.claude/hooks/maos python -m utils.hook_daemon
+
+With --stdio it instead serves one caller over stdin/stdout, one JSON line
+each way (used by the orchestration test suite to time warm hooks):
+    caller -> daemon: {"hook": "<hook name>", "input": {...hook stdin...}}
+    daemon -> caller: {"code": <exit code>, "stdout": "...", "stderr": "..."}
+"""
+
+import contextlib
+import fcntl
+import importlib.util
+import io
+import json
+import os
+import signal
+import socket
+import stat
+import sys
+
+from .path_utils import MAOS_DIR, MAOS_HOOKS_DIR, MAOS_HOOKS_SCRIPTS_DIR, PROJECT_ROOT
+
+# Hooks the daemon can run
+DAEMON_HOOKS = ("pre_tool_use", "post_tool_use")
+
+# Daemon exits after this long without a request
+DAEMON_IDLE_SECONDS = 30 * 60
+
+# Client gives up waiting for a response after this long
+CLIENT_TIMEOUT_SECONDS = 50.0
+
+
+# Private per-project directory holding the daemon socket and its lock
+RUN_DIR = str(MAOS_DIR / "run")
+
+
+def socket_path() -> str:
+    """Daemon socket path inside RUN_DIR"""
+    return os.path.join(RUN_DIR, "hookd.sock")
+
+
+def _run_dir_is_private() -> bool:
+    """True if RUN_DIR is a real directory owned by us that nobody else can enter"""
+    try:
+        st = os.lstat(RUN_DIR)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def _ensure_run_dir() -> bool:
+    """Create RUN_DIR with mode 0700 (tightening one we own); False if it can't be made private"""
+    try:
+        os.makedirs(RUN_DIR, mode=0o700, exist_ok=True)
+        st = os.lstat(RUN_DIR)
+        if stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and st.st_mode & 0o077:
+            os.chmod(RUN_DIR, 0o700)
+    except OSError:
+        return False
+    return _run_dir_is_private()
+
+
+def _recv_all(sock: socket.socket) -> bytes:
+    """Read until the peer closes its side"""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+def start_daemon():
+    """Launch the daemon detached from this hook process"""
+    import subprocess  # Only needed on the cold path
+    
+    env = dict(os.environ, PYTHONPATH=str(MAOS_HOOKS_DIR))
+    env.pop("MAOS_HOOK_DAEMON", None)  # The daemon runs hooks in-process, never forwards
+    subprocess.Popen(
+        [sys.executable, "-m", "utils.hook_daemon"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
+def forward_to_daemon(hook_name: str):
+    """Run hook_name in the daemon and exit with its result.
+    
+    Returns only when no daemon answered; stdin has then been consumed, so it
+    is replaced with the same bytes for the in-process fallback.
+    """
+    payload = sys.stdin.buffer.read()
+    
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CLIENT_TIMEOUT_SECONDS)
+        
+        # Only talk to a socket in our own private directory: anything else
+        # could answer for the security checks or read the tool payload
+        if not _run_dir_is_private():
+            raise FileNotFoundError(RUN_DIR)
+        sock.connect(socket_path())
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No daemon yet (or a stale socket) - start one for the next hook
+        sock.close()
+        try:
+            start_daemon()
+        except OSError:
+            pass
+        response = None
+    except OSError:
+        sock.close()
+        response = None
+    else:
+        # Connected: the daemon may run the request from here on, so never
+        # run it again in-process
+        try:
+            sock.sendall(hook_name.encode() + b"\n" + payload)
+            sock.shutdown(socket.SHUT_WR)
+            response = _recv_all(sock)
+        except OSError as e:
+            sys.stderr.write(f"⚠️  Hook daemon did not answer (non-blocking): {e}\n")
+            sys.stderr.flush()
+            os._exit(0)
+        finally:
+            sock.close()
+    
+    if response:
+        sys.stderr.write(response[1:].decode("utf-8", "replace"))
+        sys.stderr.flush()
+        os._exit(response[0])  # Nothing else to clean up; skip interpreter teardown
+    
+    # No daemon, or it closed without a reply (a hook it does not serve)
+    sys.stdin = io.TextIOWrapper(io.BytesIO(payload), encoding="utf-8")
+
+
+def _load_hook(hook_name: str):
+    """Import a hook script as a module (its __main__ block does not run)"""
+    path = MAOS_HOOKS_SCRIPTS_DIR / f"{hook_name}.py"
+    spec = importlib.util.spec_from_file_location(f"maos_hook_{hook_name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_hook(module, payload: bytes):
+    """Run a hook's main() against payload; returns (exit code, stderr text)"""
+    stderr = io.StringIO()
+    saved_stdin = sys.stdin
+    sys.stdin = io.TextIOWrapper(io.BytesIO(payload), encoding="utf-8")
+    code = 0
+    try:
+        with contextlib.redirect_stderr(stderr):
+            module.main()
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            stderr.write(f"{e.code}\n")
+            code = 1
+    except Exception as e:
+        stderr.write(f"⚠️  Hook daemon error (non-blocking): {e}\n")
+    finally:
+        sys.stdin = saved_stdin
+    return code, stderr.getvalue()
+
+
+def serve():
+    """Accept hook requests until idle for DAEMON_IDLE_SECONDS"""
+    if not _ensure_run_dir():
+        return  # Nowhere private to listen; hooks keep running in-process
+    path = socket_path()
+    
+    # Only one daemon per socket: hold an exclusive lock for our lifetime
+    try:
+        lock_fd = os.open(f"{path}.lock", os.O_WRONLY | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+    except OSError:
+        return
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(lock_fd)
+        return  # Another daemon is already serving
+    
+    modules = {name: _load_hook(name) for name in DAEMON_HOOKS}
+    
+    try:
+        os.unlink(path)  # Left behind by a daemon that died
+    except FileNotFoundError:
+        pass
+    except OSError:
+        os.close(lock_fd)
+        return
+    
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o077)
+    try:
+        server.bind(path)
+    except OSError:
+        # e.g. a project path too long for a unix socket name
+        server.close()
+        os.close(lock_fd)
+        return
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    server.settimeout(DAEMON_IDLE_SECONDS)
+    
+    # Remove the socket on a plain kill as well
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
+    try:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                break
+            
+            with conn:
+                try:
+                    conn.settimeout(CLIENT_TIMEOUT_SECONDS)
+                    hook_name, _, payload = _recv_all(conn).partition(b"\n")
+                    module = modules.get(hook_name.decode("utf-8", "replace"))
+                    if module is None:
+                        continue  # Unknown hook: closing without a reply sends the client in-process
+                    
+                    code, stderr = run_hook(module, payload)
+                    conn.sendall(bytes([code & 0xFF]) + stderr.encode("utf-8"))
+                except OSError:
+                    continue  # Client went away
+    finally:
+        server.close()
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        os.close(lock_fd)
+
+
+def serve_stdio():
+    """Serve JSON-line hook requests from stdin until it closes"""
+    modules = {name: _load_hook(name) for name in DAEMON_HOOKS}
+    out = sys.stdout
+    
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+            module = modules[request["hook"]]
+        except (ValueError, KeyError, TypeError) as e:
+            response = {"code": 1, "stdout": "", "stderr": f"Bad request: {e}\n"}
+        else:
+            # Hook stdout is captured too so it can't corrupt the protocol stream
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                code, stderr = run_hook(module, json.dumps(request.get("input", {})).encode())
+            response = {"code": code, "stdout": stdout.getvalue(), "stderr": stderr}
+        
+        out.write(json.dumps(response) + "\n")
+        out.flush()
+
+
+if __name__ == "__main__":
+    if "--stdio" in sys.argv[1:]:
+        serve_stdio()
+    else:
+        serve()
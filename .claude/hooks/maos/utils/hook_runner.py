@@ -0,0 +1,85 @@
+"""
+Shared main() for the tool-use hooks.
+
+pre_tool_use.py and post_tool_use.py differ only in their blocking checks and
+their follow-up work. Reading and validating stdin, the security gate, the
+JSONL log line and the exit codes live here, so each hook only registers its
+callbacks.
+
+Everything runs on the main thread without an event loop: the checks are
+synchronous, the log line is one O_APPEND write and Rust tooling is detached,
+so a loop would only add its own setup and teardown to every tool call.
+"""
+
+import sys
+import time
+from typing import Callable, Optional
+
+from .jsonl_log import log_hook_data_sync
+from .json_utils import HookPayload, JSONDecodeError, MissingSessionId, parse_hook_payload
+from .time_utils import iso_now
+
+# Returns the message to block the tool call with, or None to let it through
+SecurityCheck = Callable[[HookPayload], Optional[str]]
+
+# Runs after the log line is written; may sys.exit(2) to block the tool call
+Handler = Callable[[HookPayload], None]
+
+
+def run_hook(
+    log_path: str,
+    label: str,
+    security_check: Optional[SecurityCheck] = None,
+    handler: Optional[Handler] = None
+):
+    """Run a tool-use hook against stdin; always exits.
+    
+    Args:
+        log_path: JSONL log file (one of the *_LOG constants in path_utils)
+        label: Hook name used in stderr messages, e.g. "Pre-tool"
+        security_check: Blocking check run before anything else
+        handler: MAOS coordination and other work after the security verdict
+    """
+    try:
+        start_time = time.time()
+        
+        # Parse and validate Claude Code's input in one step
+        try:
+            payload = parse_hook_payload(sys.stdin.buffer.read())
+        except MissingSessionId as e:
+            print(f"❌ FATAL: Claude Code did not provide session_id!", file=sys.stderr)
+            print(f"Available keys: {e.args[0]}", file=sys.stderr)
+            sys.exit(1)
+        
+        # 🚨 CRITICAL SECURITY CHECKS FIRST (these can block operations)
+        if security_check:
+            blocked = security_check(payload)
+            if blocked:
+                print(blocked, file=sys.stderr)
+                sys.exit(2)  # Exit code 2 blocks tool call and shows error to Claude
+            
+            security_time = time.time() - start_time
+            print(f"🔒 Security checks completed in {security_time*1000:.2f}ms", file=sys.stderr)
+        
+        # One O_APPEND write of the JSONL line, preserving all Claude Code fields as-is
+        try:
+            log_hook_data_sync(log_path, payload.raw, timestamp=iso_now())
+        except Exception:
+            pass  # Silent failure
+        
+        # A MAOS sys.exit(2) from here becomes the hook's exit code directly
+        if handler:
+            handler(payload)
+        
+        total_time = time.time() - start_time
+        print(f"⚡ {label} hook completed in {total_time*1000:.2f}ms", file=sys.stderr)
+        
+        sys.exit(0)
+    
+    except JSONDecodeError:
+        # Gracefully handle JSON decode errors
+        sys.exit(0)
+    except Exception as e:
+        # Handle any other errors gracefully - don't block operations
+        print(f"⚠️  {label} hook error (non-blocking): {e}", file=sys.stderr)
+        sys.exit(0)
@@ -0,0 +1,184 @@
+"""
+Shared JSON helpers for Claude Code hooks.
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+import mmap
+import os
+import threading
+from typing import Any, Dict, List, NamedTuple, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Files at least this large are parsed straight from a read-only memory map
+MMAP_MIN_BYTES = 1024 * 1024
+
+
+if orjson is not None:
+    JSONDecodeError = orjson.JSONDecodeError
+
+    def loads(data):
+        """Parse JSON from bytes or str"""
+        return orjson.loads(data)
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes"""
+        if indent:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+        return orjson.dumps(obj)
+else:
+    JSONDecodeError = json.JSONDecodeError
+
+    def loads(data):
+        """Parse JSON from bytes or str"""
+        return json.loads(data)
+
+    def dumps(obj, indent: bool = False) -> bytes:
+        """Serialize to UTF-8 JSON bytes"""
+        if indent:
+            return (json.dumps(obj, indent=2) + "\n").encode()
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+
+class MissingSessionId(ValueError):
+    """Hook input parsed, but Claude Code did not provide session_id; args[0] lists the keys it did send"""
+
+
+class HookPayload(NamedTuple):
+    """Hook stdin with the fields the tool-use hooks read pulled out once"""
+    raw: Dict[str, Any]  # Complete payload, logged as-is
+    session_id: str
+    tool_name: str
+    tool_input: Dict[str, Any]
+    tool_response: Dict[str, Any]
+    metadata: Dict[str, Any]
+
+
+def parse_hook_payload(data) -> HookPayload:
+    """Parse and validate hook stdin in one step.
+    
+    Raises JSONDecodeError for malformed input and MissingSessionId when the
+    payload is not an object carrying session_id.
+    """
+    payload = loads(data)
+    if type(payload) is not dict:
+        raise MissingSessionId([])
+    try:
+        session_id = payload['session_id']
+    except KeyError:
+        raise MissingSessionId(list(payload)) from None
+    
+    get = payload.get
+    return HookPayload(
+        payload,
+        session_id,
+        get('tool_name', ''),
+        get('tool_input', {}),
+        get('tool_response', {}),
+        get('metadata', {})
+    )
+
+
+def load_json_file(path):
+    """Parse a JSON file, memory-mapping it when it is large"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < MMAP_MIN_BYTES:
+            return loads(f.read())
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if orjson is None:
+                return loads(mm[:])
+            
+            # orjson parses the mapped pages directly; release the view before unmapping
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+def atomic_write_json(path, obj, indent: bool = True):
+    """Write JSON with one write() to a temp file, then rename it over path"""
+    path = str(path)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, dumps(obj, indent=indent))
+    finally:
+        os.close(fd)
+    
+    try:
+        os.replace(temp_path, path)
+    except OSError:
+        os.unlink(temp_path)
+        raise
+
+
+def create_json_exclusive(path, obj, indent: bool = True) -> bool:
+    """Publish a complete JSON file at path only if it does not exist yet.
+    
+    The file is written to a temp name and hard-linked into place, so the
+    existence check and the creation are one atomic step. Returns False if
+    path already existed.
+    """
+    path = str(path)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, dumps(obj, indent=indent))
+    finally:
+        os.close(fd)
+    
+    try:
+        os.link(temp_path, path)
+        return True
+    except FileExistsError:
+        return False
+    finally:
+        os.unlink(temp_path)
+
+
+class WriteBatch:
+    """Collects coordination file writes so each path is written once per hook"""
+    
+    def __init__(self):
+        self._files: Dict[str, Tuple[Any, bool]] = {}
+        self._appends: Dict[str, List[Any]] = {}
+    
+    def __bool__(self):
+        return bool(self._files or self._appends)
+    
+    def set(self, path, obj, indent: bool = True):
+        """Replace the whole contents of path with obj"""
+        self._files[str(path)] = (obj, indent)
+    
+    def append_jsonl(self, path, record):
+        """Append one JSON line to path"""
+        self._appends.setdefault(str(path), []).append(record)
+    
+    def commit(self) -> Dict[str, int]:
+        """Write everything collected so far; returns the end offset of each appended log"""
+        files, self._files = self._files, {}
+        appends, self._appends = self._appends, {}
+        
+        for path, (obj, indent) in files.items():
+            try:
+                atomic_write_json(path, obj, indent)
+            except OSError:
+                continue  # Non-blocking: session directory may be gone
+        
+        log_sizes = {}
+        for path, records in appends.items():
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            except OSError:
+                continue
+            try:
+                os.write(fd, b"".join(dumps(record) + b"\n" for record in records))
+                log_sizes[path] = os.lseek(fd, 0, os.SEEK_CUR)
+            finally:
+                os.close(fd)
+        
+        return log_sizes
@@ -0,0 +1,99 @@
+"""
+Synchronous JSONL logging for Claude Code hooks.
+
+Every record is one os.write() on an O_APPEND descriptor opened once per
+process; records too long for one atomic write are written under flock.
+Kept apart from async_logging so that hooks which only append a line do
+not import asyncio and concurrent.futures on every invocation.
+"""
+
+import fcntl
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+
+from .json_utils import dumps
+from .time_utils import iso_now
+
+
+# MAOS_LOG=0 turns every hook JSONL log into a no-op (CI, scripted runs)
+LOG_ENABLED = os.environ.get('MAOS_LOG', '1') != '0'
+
+# Records up to this size go out in one write that concurrent hooks can't split;
+# longer ones (large tool payloads) are written under an exclusive flock
+ATOMIC_APPEND_BYTES = 4096  # PIPE_BUF on Linux
+
+# O_APPEND descriptors per log path, opened once per process
+_LOG_FDS: Dict[str, int] = {}
+
+
+def _get_log_fd(log_file: Union[str, Path]) -> int:
+    """Open (once) an append-only descriptor for log_file."""
+    key = str(log_file)
+    fd = _LOG_FDS.get(key)
+    if fd is None:
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | os.O_CLOEXEC
+        try:
+            fd = os.open(key, flags, 0o644)
+        except FileNotFoundError:
+            # Only pay for mkdir the first time a log directory is missing
+            Path(key).parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(key, flags, 0o644)
+        _LOG_FDS[key] = fd
+    return fd
+
+
+def close_logs_under(directory: Union[str, Path]) -> None:
+    """Drop cached descriptors for logs inside directory (it was removed and is being recreated)."""
+    prefix = os.path.join(str(directory), '')
+    for key in [key for key in _LOG_FDS if key.startswith(prefix)]:
+        os.close(_LOG_FDS.pop(key))
+
+
+def _jsonl_line(timestamp: str, data: Dict[Any, Any]) -> bytes:
+    """Serialize data as one JSONL record with timestamp as its first field.
+    
+    The timestamp is spliced in front of the encoded data rather than merged
+    into a copy of the dict.
+    """
+    body = dumps(data)
+    if 'timestamp' in data:
+        return body + b"\n"  # The caller's own timestamp wins, as a dict merge would
+    prefix = b'{"timestamp":"' + timestamp.encode() + b'"'
+    if body == b"{}":
+        return prefix + b"}\n"
+    return prefix + b"," + body[1:] + b"\n"
+
+
+def _append_jsonl(log_file: Union[str, Path], timestamp: str, data: Dict[Any, Any]) -> None:
+    """Append one JSONL record with a single O_APPEND write (no fsync; lock only when oversized)."""
+    fd = _get_log_fd(log_file)
+    line = _jsonl_line(timestamp, data)
+    if len(line) <= ATOMIC_APPEND_BYTES:
+        os.write(fd, line)
+        return
+    
+    # A long write may come back short; finish it before another oversized record starts
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        view = memoryview(line)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def log_hook_data_sync(log_file: Union[str, Path], data: Dict[Any, Any], timestamp: Optional[str] = None) -> None:
+    """Append one timestamped record to log_file; logging failures are swallowed.
+    
+    timestamp defaults to the current UTC time; hooks pass their local-time iso_now().
+    Returns without encoding anything when logging is disabled with MAOS_LOG=0.
+    """
+    if not LOG_ENABLED:
+        return
+    
+    try:
+        _append_jsonl(log_file, timestamp or iso_now(utc=True), data)
+    except Exception:
+        # Fail silently for logging
+        pass
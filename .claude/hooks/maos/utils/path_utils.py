@@ -3,6 +3,7 @@ Shared path utilities for Claude Code hooks.
 Provides centralized path resolution and common directory constants.
 """
 
+from functools import lru_cache
 from pathlib import Path
 import os
 
@@ -25,6 +26,30 @@ def get_project_root():
     # Simple and fast - Claude Code maintains the working directory for us
     return Path.cwd()
 
+@lru_cache(maxsize=None)
+def find_git_root():
+    """Get the enclosing git work tree root without forking git.
+    
+    Walks up from the current working directory looking for a .git entry
+    (a directory for the main checkout, a file for worktrees). Only falls
+    back to `git rev-parse` if none is found, then to the working directory.
+    """
+    cwd = Path.cwd()
+    for candidate in (cwd, *cwd.parents):
+        if (candidate / '.git').exists():
+            return candidate
+    
+    try:
+        import subprocess
+        root = subprocess.check_output(
+            ['git', 'rev-parse', '--show-toplevel'],
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+        return Path(root)
+    except Exception:
+        return cwd
+
 # Define common paths as constants
 PROJECT_ROOT = get_project_root()
 LOGS_DIR = PROJECT_ROOT / 'logs'
@@ -35,6 +60,17 @@ MAOS_HOOKS_SCRIPTS_DIR = MAOS_HOOKS_DIR / 'hooks'  # This is where hook scripts
 TTS_DIR = MAOS_HOOKS_DIR / 'tts'  # TTS scripts directory
 WORKTREES_DIR = PROJECT_ROOT / 'worktrees'
 
+# Hook log files as plain strings, built once so hooks hand them straight to os.open
+CHAT_LOG = str(LOGS_DIR / 'chat.jsonl')
+NOTIFICATION_LOG = str(LOGS_DIR / 'notification.jsonl')
+POST_TOOL_USE_LOG = str(LOGS_DIR / 'post_tool_use.jsonl')
+PRE_COMPACT_LOG = str(LOGS_DIR / 'pre_compact.jsonl')
+PRE_TOOL_USE_LOG = str(LOGS_DIR / 'pre_tool_use.jsonl')
+SESSION_START_LOG = str(LOGS_DIR / 'session_start.jsonl')
+STOP_LOG = str(LOGS_DIR / 'stop.jsonl')
+SUBAGENT_STOP_LOG = str(LOGS_DIR / 'subagent_stop.jsonl')
+USER_PROMPT_LOG = str(LOGS_DIR / 'user_prompt_submit.jsonl')
+
 def setup_maos_imports():
     """Setup Python import path for MAOS modules.
     
@@ -0,0 +1,124 @@
+"""
+Detached cargo fmt + clippy runner for the post-tool hook.
+
+The hook only records a request and, when no runner is active, spawns this
+module in its own session so cargo outlives the hook process. Requests that
+arrive while a runner holds the lock are picked up by that runner, so a burst
+of .rs edits costs one or two passes rather than one per edit.
+
+Run directly with:  PYTHONPATH=.claude/hooks/maos python -m utils.rust_tooling
+"""
+
+import fcntl
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from .json_utils import dumps
+from .path_utils import LOGS_DIR, MAOS_HOOKS_DIR, PROJECT_ROOT
+
+# Held by the active runner for its whole lifetime
+RUST_TOOLING_LOCK = LOGS_DIR / 'rust_tooling.lock'
+
+# Touched by every hook that wants a pass; removed by the runner as it starts one
+RUST_TOOLING_RERUN = LOGS_DIR / 'rust_tooling.rerun'
+
+# Result of the last completed pass
+RUST_TOOLING_STATUS = LOGS_DIR / 'rust_tooling.status'
+
+
+def _try_lock():
+    """Return a descriptor holding the runner lock, or None if a runner is active"""
+    lock_fd = os.open(RUST_TOOLING_LOCK, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o644)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(lock_fd)
+        return None
+    return lock_fd
+
+
+def request_rust_tooling(file_path: str) -> bool:
+    """Queue a fmt + clippy pass for file_path; returns True if a runner was spawned"""
+    LOGS_DIR.mkdir(parents=True, exist_ok=True)
+    # Request a pass before checking the lock, so a runner that is about to
+    # finish always sees it
+    RUST_TOOLING_RERUN.write_text(file_path)
+    
+    lock_fd = _try_lock()
+    if lock_fd is None:
+        return False  # The active runner will pick up our request
+    os.close(lock_fd)
+    
+    env = dict(os.environ, PYTHONPATH=str(MAOS_HOOKS_DIR))
+    subprocess.Popen(
+        [sys.executable, '-m', 'utils.rust_tooling'],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        start_new_session=True
+    )
+    return True
+
+
+def _run_cargo(args, timeout: float):
+    """Run one cargo command; returns its exit code, or None on timeout"""
+    try:
+        return subprocess.run(
+            ['cargo', *args],
+            cwd=PROJECT_ROOT,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout
+        ).returncode
+    except subprocess.TimeoutExpired:
+        return None
+
+
+def run_passes():
+    """Run fmt + clippy until no request is pending, writing the status after each pass"""
+    while True:
+        lock_fd = _try_lock()
+        if lock_fd is None:
+            return  # Another runner got here first
+        
+        try:
+            while RUST_TOOLING_RERUN.exists():
+                try:
+                    file_path = RUST_TOOLING_RERUN.read_text()
+                except FileNotFoundError:
+                    file_path = ''
+                RUST_TOOLING_RERUN.unlink(missing_ok=True)
+                
+                # Sequential on purpose: fmt and clippy --fix both rewrite sources
+                fmt_code = _run_cargo(['fmt'], timeout=30)
+                clippy_code = _run_cargo([
+                    'clippy',
+                    '--fix', '--allow-dirty', '--allow-staged',
+                    '--', '-D', 'warnings'
+                ], timeout=60)
+                
+                RUST_TOOLING_STATUS.write_bytes(dumps({
+                    'timestamp': datetime.now().isoformat(),
+                    'file_path': file_path,
+                    'fmt': fmt_code,
+                    'clippy': clippy_code
+                }) + b"\n")
+        finally:
+            os.close(lock_fd)  # Releases the flock
+        
+        # A request that arrived while we were unlocking needs another pass
+        if not RUST_TOOLING_RERUN.exists():
+            return
+
+
+if __name__ == '__main__':
+    try:
+        run_passes()
+    except Exception:
+        pass  # Detached: nobody to report to
@@ -18,8 +18,27 @@ import time
 import shutil
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from .async_logging import log_hook_data
+from typing import Dict, List, Optional, Any, Tuple
+from .jsonl_log import log_hook_data_sync
+from .json_utils import JSONDecodeError, atomic_write_json, create_json_exclusive, loads
+from .path_utils import find_git_root
+
+# Parsed agent files: path -> (st_mtime_ns, st_size, st_ino, data)
+_AGENT_FILE_CACHE: Dict[str, Tuple[int, int, int, Dict[str, Any]]] = {}
+
+
+def _load_agent_file(path) -> Dict[str, Any]:
+    """Parse an agent state file, reusing the previous parse while it is unchanged"""
+    key = str(path)
+    st = os.stat(key)
+    cached = _AGENT_FILE_CACHE.get(key)
+    if cached and cached[:3] == (st.st_mtime_ns, st.st_size, st.st_ino):
+        return cached[3]
+    
+    with open(key, 'rb') as f:
+        data = loads(f.read())
+    _AGENT_FILE_CACHE[key] = (st.st_mtime_ns, st.st_size, st.st_ino, data)
+    return data
 
 class MAOSStateManager:
     """Universal file-based concurrent state management for MAOS session coordination"""
@@ -50,17 +69,7 @@ class MAOSStateManager:
     
     def _get_project_root(self) -> Path:
         """Get project root using git or current working directory"""
-        try:
-            import subprocess
-            root = subprocess.check_output(
-                ['git', 'rev-parse', '--show-toplevel'],
-                stderr=subprocess.DEVNULL,
-                text=True
-            ).strip()
-            return Path(root)
-        except Exception:
-            # Fall back to current working directory
-            return Path.cwd()
+        return find_git_root()
     
     def _ensure_directories(self):
         """Create all required state directories if they don't exist"""
@@ -78,10 +87,6 @@ class MAOSStateManager:
         """
         agent_file = self.pending_agents_dir / f"{agent_id}.json"
         
-        # Atomic check-and-create
-        if agent_file.exists():
-            return False  # Agent already registered
-            
         agent_data = {
             "agent_id": agent_id,
             "agent_type": agent_type,
@@ -92,43 +97,39 @@ class MAOSStateManager:
             "cwd": hook_data.get("cwd")
         }
         
-        try:
-            # Write atomically using temp file + rename
-            temp_file = agent_file.with_suffix(".tmp")
-            with open(temp_file, 'w') as f:
-                json.dump(agent_data, f, indent=2)
-            temp_file.rename(agent_file)
-            
-            # Log lifecycle event
-            self._log_lifecycle_event("agent_registered", agent_id, agent_type, {"status": "pending"})
-            return True
-            
-        except Exception as e:
-            # Clean up temp file if it exists
-            if temp_file.exists():
-                temp_file.unlink()
-            raise e
+        # Atomic check-and-create of this agent's own file
+        if not create_json_exclusive(agent_file, agent_data, indent=False):
+            return False  # Agent already registered
+        
+        # Log lifecycle event
+        self._log_lifecycle_event("agent_registered", agent_id, agent_type, {"status": "pending"})
+        return True
     
-    def transition_to_active(self, agent_id: str, workspace_path: str) -> bool:
+    def transition_to_active(self, agent_id: str, workspace_path: str, agent_data: Optional[Dict[str, Any]] = None) -> bool:
         """
         Atomically transition agent from pending to active state.
         
         Uses atomic file rename - no race conditions possible.
+        Pass agent_data when the pending record was already loaded to skip re-reading it.
         Returns True if transition successful, False if agent not in pending state.
         """
         pending_file = self.pending_agents_dir / f"{agent_id}.json"
         active_file = self.active_agents_dir / f"{agent_id}.json"
         
-        if not pending_file.exists():
-            return False  # Agent not in pending state
-            
         if active_file.exists():
             return False  # Agent already active
         
+        # Read current agent data unless the caller already has it; opening the
+        # pending file doubles as the pending-state check
+        if agent_data is None:
+            try:
+                with open(pending_file, 'rb') as f:
+                    agent_data = loads(f.read())
+            except FileNotFoundError:
+                return False  # Agent not in pending state
+        
         try:
-            # Read current agent data
-            with open(pending_file, 'r') as f:
-                agent_data = json.load(f)
+            agent_data = dict(agent_data)
             
             # Update with workspace info
             agent_data.update({
@@ -138,11 +139,10 @@ class MAOSStateManager:
             })
             
             # Write to active directory
-            with open(active_file, 'w') as f:
-                json.dump(agent_data, f, indent=2)
+            atomic_write_json(active_file, agent_data, indent=False)
             
             # Remove from pending (atomic state transition complete)
-            pending_file.unlink()
+            pending_file.unlink(missing_ok=True)
             
             # Log lifecycle event
             self._log_lifecycle_event("workspace_created", agent_id, agent_data["agent_type"], {
@@ -153,8 +153,7 @@ class MAOSStateManager:
             
         except Exception as e:
             # Clean up partial state if active file was created
-            if active_file.exists():
-                active_file.unlink()
+            active_file.unlink(missing_ok=True)
             raise e
     
     def transition_to_completed(self, agent_id: str) -> bool:
@@ -166,14 +165,14 @@ class MAOSStateManager:
         active_file = self.active_agents_dir / f"{agent_id}.json"
         completed_file = self.completed_agents_dir / f"{agent_id}.json"
         
-        if not active_file.exists():
+        try:
+            # Read current agent data (a missing file means the agent is not active)
+            with open(active_file, 'rb') as f:
+                agent_data = loads(f.read())
+        except FileNotFoundError:
             return False  # Agent not in active state
             
         try:
-            # Read current agent data
-            with open(active_file, 'r') as f:
-                agent_data = json.load(f)
-            
             # Update completion info
             agent_data.update({
                 "status": "completed",
@@ -181,8 +180,7 @@ class MAOSStateManager:
             })
             
             # Write to completed directory
-            with open(completed_file, 'w') as f:
-                json.dump(agent_data, f, indent=2)
+            atomic_write_json(completed_file, agent_data, indent=False)
             
             # Remove from active (atomic state transition complete)
             active_file.unlink()
@@ -195,8 +193,7 @@ class MAOSStateManager:
             
         except Exception as e:
             # Clean up partial state if completed file was created
-            if completed_file.exists():
-                completed_file.unlink()
+            completed_file.unlink(missing_ok=True)
             raise e
     
     def get_agent_state(self, agent_id: str) -> Optional[str]:
@@ -209,28 +206,41 @@ class MAOSStateManager:
             return "completed"
         return None
     
-    def get_pending_agents(self) -> List[Dict[str, Any]]:
-        """Get all pending agents. O(1) directory listing vs O(n) JSON parsing"""
-        agents = []
-        for agent_file in self.pending_agents_dir.glob("*.json"):
+    def get_agent_record(self, agent_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Get (state, agent data) by reading only this agent's state file"""
+        for state, state_dir in (
+            ("pending", self.pending_agents_dir),
+            ("active", self.active_agents_dir),
+            ("completed", self.completed_agents_dir)
+        ):
             try:
-                with open(agent_file, 'r') as f:
-                    agents.append(json.load(f))
-            except (json.JSONDecodeError, OSError):
-                # Skip corrupted files
+                return state, _load_agent_file(state_dir / f"{agent_id}.json")
+            except (FileNotFoundError, JSONDecodeError):
+                # Not in this state (or mid-transition) - try the next one
                 continue
+        return None
+    
+    def _read_agent_dir(self, state_dir: Path) -> List[Dict[str, Any]]:
+        """Read every agent file in a state directory"""
+        agents = []
+        with os.scandir(state_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    agents.append(_load_agent_file(entry.path))
+                except (JSONDecodeError, OSError):
+                    # Skip corrupted files
+                    continue
         return agents
     
+    def get_pending_agents(self) -> List[Dict[str, Any]]:
+        """Get all pending agents. O(1) directory listing vs O(n) JSON parsing"""
+        return self._read_agent_dir(self.pending_agents_dir)
+    
     def get_active_agents(self) -> List[Dict[str, Any]]:
         """Get all active agents"""
-        agents = []
-        for agent_file in self.active_agents_dir.glob("*.json"):
-            try:
-                with open(agent_file, 'r') as f:
-                    agents.append(json.load(f))
-            except (json.JSONDecodeError, OSError):
-                continue
-        return agents
+        return self._read_agent_dir(self.active_agents_dir)
     
     def cleanup_stale_agents(self, max_age_hours: int = 24) -> Dict[str, int]:
         """
@@ -287,8 +297,7 @@ class MAOSStateManager:
         }
         
         try:
-            with open(self.cleanup_log, 'w') as f:
-                json.dump(cleanup_record, f, indent=2)
+            atomic_write_json(self.cleanup_log, cleanup_record)
         except Exception:
             # Don't fail cleanup if logging fails
             pass
@@ -337,8 +346,7 @@ class MAOSStateManager:
                             "migration_timestamp": datetime.utcnow().isoformat()
                         }
                         
-                        with open(agent_file, 'w') as f:
-                            json.dump(migrated_data, f, indent=2)
+                        atomic_write_json(agent_file, migrated_data, indent=False)
                         
                         migrated_count += 1
                         
@@ -363,22 +371,8 @@ class MAOSStateManager:
             "details": details
         }
         
-        # Use unified async logging system
-        try:
-            import asyncio
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # Already in async context, schedule the coroutine
-                loop.create_task(log_hook_data(self.lifecycle_log, log_data))
-            else:
-                # Run in new event loop
-                asyncio.run(log_hook_data(self.lifecycle_log, log_data))
-        except Exception:
-            # Fallback to synchronous logging if async fails
-            import json
-            with open(self.lifecycle_log, 'a') as f:
-                json.dump({**log_data, "timestamp": datetime.utcnow().isoformat()}, f)
-                f.write('\n')
+        # One O_APPEND write; an event loop per event would cost more than the write
+        log_hook_data_sync(self.lifecycle_log, log_data)
     
     def _get_last_cleanup_time(self) -> Optional[str]:
         """Get timestamp of last cleanup operation"""
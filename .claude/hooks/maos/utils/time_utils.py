@@ -0,0 +1,32 @@
+"""
+Shared timestamp helpers for Claude Code hooks.
+Hot paths record raw time.time_ns() integers; formatting happens only on read.
+"""
+
+import time
+from datetime import datetime
+
+_ISO_SECONDS_FMT = "%Y-%m-%dT%H:%M:%S"
+
+# Formatted seconds part of the last timestamp, per clock: {utc: (epoch second, text)}
+_seconds_cache = {False: (None, ""), True: (None, "")}
+
+
+def format_ts(ns: int) -> str:
+    """Format a time.time_ns() value as a local ISO-8601 timestamp"""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000).isoformat()
+
+
+def iso_now(utc: bool = False) -> str:
+    """Current time in datetime.now().isoformat() form (utcnow() with utc=True).
+    
+    Builds no datetime object: the seconds part is formatted once per second
+    and reused, and the microseconds come from integer math on time_ns().
+    """
+    seconds, remainder = divmod(time.time_ns(), 1_000_000_000)
+    cached_second, prefix = _seconds_cache[utc]
+    if seconds != cached_second:
+        prefix = time.strftime(_ISO_SECONDS_FMT, time.gmtime(seconds) if utc else time.localtime(seconds))
+        _seconds_cache[utc] = (seconds, prefix)
+    return f"{prefix}.{remainder // 1000:06d}"
@@ -0,0 +1,156 @@
+"""
+Client side of the persistent TTS workers (tts/worker.py).
+
+say() hands a message to the worker for a provider script as one datagram
+and returns without waiting. The first call that finds no worker starts one
+in the background and speaks that message with a one-off process, so nothing
+is lost while the worker comes up.
+
+Worker sockets live in a 0700 directory owned by the current user, checked
+before every send, so another local user can't bind the path first and
+receive the messages. When that directory can't be verified, every message
+gets a one-off process instead.
+"""
+
+import hashlib
+import os
+import re
+import socket
+import stat
+import sys
+import tempfile
+from functools import lru_cache
+from typing import List, Optional
+
+from .config import get_active_tts_provider
+from .json_utils import dumps
+from .path_utils import TTS_DIR
+
+# TTS scripts whose PEP 723 header declares no dependencies; these run on the
+# current interpreter instead of paying for uv's environment resolution
+_STDLIB_TTS_SCRIPTS = frozenset({"macos.py"})
+
+# Entries of a PEP 723 `# dependencies = [...]` block
+_DEPENDENCY_RE = re.compile(r'^#\s+"([^"]+)",?\s*$')
+
+TTS_WORKER_SCRIPT = TTS_DIR / "worker.py"
+
+# TTS scripts by name: the providers plus stop.py's response reader
+_TTS_SCRIPTS = {
+    name: str(TTS_DIR / f"{name}.py")
+    for name in ("macos", "elevenlabs", "openai", "pyttsx3", "response")
+}
+
+# Largest message the worker receives whole (MAX_MESSAGE_BYTES in tts/worker.py)
+MAX_MESSAGE_BYTES = 64 * 1024
+
+# Private per-user directory holding the worker sockets and their locks
+RUN_DIR = os.path.join(os.getenv("XDG_RUNTIME_DIR") or tempfile.gettempdir(), f"maos-tts-{os.getuid()}")
+
+
+def socket_path(tts_script: str) -> str:
+    """Per-provider-script socket path inside RUN_DIR"""
+    script_key = hashlib.sha256(tts_script.encode()).hexdigest()[:16]
+    return os.path.join(RUN_DIR, f"{script_key}.sock")
+
+
+def _ensure_run_dir() -> bool:
+    """Create RUN_DIR with mode 0700; False unless it is a directory only we can enter"""
+    try:
+        os.makedirs(RUN_DIR, mode=0o700, exist_ok=True)
+        st = os.lstat(RUN_DIR)
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+@lru_cache(maxsize=1)
+def _available_tts_scripts() -> dict:
+    """Scripts don't appear or disappear mid-session, so check each one once"""
+    return {name: path for name, path in _TTS_SCRIPTS.items() if os.path.exists(path)}
+
+
+def tts_script_path(name: str) -> Optional[str]:
+    """Path of the named TTS script, or None when it isn't installed"""
+    return _available_tts_scripts().get(name)
+
+
+def resolve_tts_script() -> Optional[str]:
+    """Script for the configured provider (config.json decides), falling back to macOS"""
+    scripts = _available_tts_scripts()
+    return scripts.get(get_active_tts_provider()) or scripts.get("macos")
+
+
+def tts_command(tts_script: str, message: str) -> List[str]:
+    """Build the argv that runs a TTS script once"""
+    if os.path.basename(tts_script) in _STDLIB_TTS_SCRIPTS:
+        return [sys.executable, tts_script, message]
+    return ["uv", "run", tts_script, message]
+
+
+def spawn_detached(argv: List[str]):
+    """Start argv in the background with stdout/stderr discarded - never waits."""
+    file_actions = [
+        (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+        (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+    ]
+    os.posix_spawnp(argv[0], argv, os.environ, file_actions=file_actions, setsid=True)
+
+
+@lru_cache(maxsize=None)
+def script_dependencies(tts_script: str) -> tuple:
+    """Dependencies declared in a script's PEP 723 header"""
+    dependencies = []
+    in_block = False
+    with open(tts_script, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("# dependencies = ["):
+                in_block = True
+            elif in_block:
+                match = _DEPENDENCY_RE.match(line)
+                if not match:
+                    break  # "# ]" closes the block
+                dependencies.append(match.group(1))
+            elif not line.startswith("#"):
+                break  # Past the header
+    return tuple(dependencies)
+
+
+def worker_command(tts_script: str) -> List[str]:
+    """Build the argv that starts the worker for tts_script with its dependencies"""
+    sock_path = socket_path(tts_script)
+    if os.path.basename(tts_script) in _STDLIB_TTS_SCRIPTS:
+        return [sys.executable, str(TTS_WORKER_SCRIPT), sock_path, tts_script]
+    
+    argv = ["uv", "run", "--no-project"]
+    for dependency in script_dependencies(tts_script):
+        argv += ["--with", dependency]
+    return argv + ["python", str(TTS_WORKER_SCRIPT), sock_path, tts_script]
+
+
+def say(tts_script: str, message: str) -> bool:
+    """Speak message with tts_script's worker, starting it if needed; never waits."""
+    packet = dumps({"message": message})
+    if len(packet) > MAX_MESSAGE_BYTES or not _ensure_run_dir():
+        # Would arrive truncated, or there is nowhere private to reach a
+        # worker; either way the message gets a process of its own
+        spawn_detached(tts_command(tts_script, message))
+        return True
+    
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.setblocking(False)
+        sock.sendto(packet, socket_path(tts_script))
+        return True
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No worker yet (or a stale socket) - start one for the next message
+        spawn_detached(worker_command(tts_script))
+    except BlockingIOError:
+        return False  # Worker is backed up with older messages; drop this one
+    except OSError:
+        pass  # e.g. message too long for one datagram
+    finally:
+        sock.close()
+    
+    spawn_detached(tts_command(tts_script, message))
+    return True